@@ -0,0 +1,171 @@
+import secrets
+import threading
+import time
+
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core import signing
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils import timezone as django_timezone
+from rest_framework import authentication, exceptions
+from rest_framework.request import Request
+
+from api.models import RevokedToken
+
+TOKEN_KEYWORD = "Token"  # noqa: S105
+TOKEN_SALT = "api.authentication.token"  # noqa: S105
+
+Claims = dict[str, Any]
+
+
+def issue_token(user: User, author_id: Optional[int]) -> tuple[str, Claims]:
+    issued_at = int(time.time())
+    claims: Claims = {
+        "uid": user.pk,
+        "usr": user.get_username(),
+        "aid": author_id,
+        "jti": secrets.token_hex(16),
+        "exp": issued_at + settings.API_TOKEN_TTL,
+    }
+    return signing.dumps(claims, salt=TOKEN_SALT, compress=True), claims
+
+
+def user_state_key(user_id: int) -> str:
+    return f"api:user-state:{user_id}"
+
+
+def user_state(user_id: int) -> tuple[bool, bool]:
+    # Cached briefly, so deactivating or demoting a user applies within
+    # API_TOKEN_USER_STATE_TTL seconds rather than when the token expires.
+    key = user_state_key(user_id)
+    state = cache.get(key)
+    if state is None:
+        row = User.objects.filter(pk=user_id).values_list("is_active", "is_staff")
+        state = row.first() or (False, False)
+        cache.set(key, state, settings.API_TOKEN_USER_STATE_TTL)
+    is_active, is_staff = state
+    return is_active, is_staff
+
+
+def forget_user_state(user_id: int) -> None:
+    cache.delete(user_state_key(user_id))
+    ResolvedTokenCache.forget_user(user_id)
+
+
+def user_from_claims(claims: Claims) -> User:
+    is_active, is_staff = user_state(claims["uid"])
+    if not is_active:
+        raise exceptions.AuthenticationFailed("User inactive or deleted.")
+    return User.from_db(
+        DEFAULT_DB_ALIAS,
+        ["id", "username", "is_staff", "is_active"],
+        [claims["uid"], claims["usr"], is_staff, is_active],
+    )
+
+
+class TokenDenyList:
+    _jtis: frozenset[str] = frozenset()
+    _loaded_at: float = float("-inf")
+    _lock = threading.Lock()
+
+    @classmethod
+    def contains(cls, jti: str) -> bool:
+        if time.monotonic() - cls._loaded_at > settings.API_TOKEN_DENYLIST_REFRESH:
+            cls.refresh()
+        return jti in cls._jtis
+
+    @classmethod
+    def refresh(cls) -> None:
+        with cls._lock:
+            cls._jtis = frozenset(
+                RevokedToken.objects.filter(
+                    expires_at__gt=django_timezone.now(),
+                ).values_list("jti", flat=True),
+            )
+            cls._loaded_at = time.monotonic()
+
+    @classmethod
+    def revoke(cls, claims: Claims) -> None:
+        now = django_timezone.now()
+        RevokedToken.objects.filter(expires_at__lte=now).delete()
+        RevokedToken.objects.get_or_create(
+            jti=claims["jti"],
+            defaults={
+                "expires_at": datetime.fromtimestamp(claims["exp"], tz=timezone.utc),
+            },
+        )
+        with cls._lock:
+            cls._jtis = cls._jtis | {claims["jti"]}
+
+
+class ResolvedTokenCache:
+    max_size: int = 1024
+    _entries: dict[str, tuple[float, User, Claims]] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, token: str) -> Optional[tuple[User, Claims]]:
+        entry = cls._entries.get(token)
+        if entry is None:
+            return None
+        expires, user, claims = entry
+        if expires < time.time():
+            cls._entries.pop(token, None)
+            return None
+        return user, claims
+
+    @classmethod
+    def store(cls, token: str, user: User, claims: Claims) -> None:
+        expires = min(time.time() + settings.API_TOKEN_CACHE_TTL, claims["exp"])
+        with cls._lock:
+            while len(cls._entries) >= cls.max_size:
+                cls._entries.pop(next(iter(cls._entries)))
+            cls._entries[token] = (expires, user, claims)
+
+    @classmethod
+    def forget_user(cls, user_id: int) -> None:
+        with cls._lock:
+            for token, (_, user, _claims) in list(cls._entries.items()):
+                if user.pk == user_id:
+                    del cls._entries[token]
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._entries.clear()
+
+
+class SignedTokenAuthentication(authentication.BaseAuthentication):
+    def authenticate(self, request: Request) -> Optional[tuple[User, Claims]]:
+        header = authentication.get_authorization_header(request).split()
+        if not header or header[0].lower() != TOKEN_KEYWORD.lower().encode():
+            return None
+        if len(header) != 2:  # noqa: PLR2004
+            raise exceptions.AuthenticationFailed("Invalid token header.")
+
+        token = header[1].decode("ascii", errors="replace")
+        resolved = ResolvedTokenCache.get(token)
+        if resolved is None:
+            try:
+                claims: Claims = signing.loads(
+                    token,
+                    salt=TOKEN_SALT,
+                    max_age=settings.API_TOKEN_TTL,
+                )
+            except signing.SignatureExpired as err:
+                raise exceptions.AuthenticationFailed("Token has expired.") from err
+            except signing.BadSignature as err:
+                raise exceptions.AuthenticationFailed("Invalid token.") from err
+            resolved = user_from_claims(claims), claims
+            ResolvedTokenCache.store(token, *resolved)
+
+        if TokenDenyList.contains(resolved[1]["jti"]):
+            raise exceptions.AuthenticationFailed("Token has been revoked.")
+        return resolved
+
+    def authenticate_header(self, _request: Request) -> str:
+        return TOKEN_KEYWORD
@@ -0,0 +1,107 @@
+import hashlib
+import threading
+import time
+
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+
+POST_LIST_VERSION_KEY = "posts:list:version"
+
+_fill_locks: dict[str, tuple[threading.Lock, int]] = {}
+_fill_locks_guard = threading.Lock()
+
+
+def post_detail_version_key(post_id: Any) -> str:
+    return f"posts:detail:{post_id}:version"
+
+
+def post_detail_key(post_id: Any) -> str:
+    # Versioned like the lists, so a fill that started before an invalidation
+    # stores its payload under a key nobody reads any more.
+    version = cache.get_or_set(post_detail_version_key(post_id), 1, timeout=None)
+    return f"posts:detail:{post_id}:{version}"
+
+
+def post_list_key(host: str, query_params: dict[str, list[str]]) -> str:
+    # Bumping the version orphans every cached page at once.
+    version = cache.get_or_set(POST_LIST_VERSION_KEY, 1, timeout=None)
+    query = urlencode(sorted(query_params.items()), doseq=True)
+    digest = hashlib.sha256(f"{host}?{query}".encode()).hexdigest()
+    return f"posts:list:{version}:{digest}"
+
+
+def invalidate_post(post_id: int, *, lists: bool) -> None:
+    bump_version(post_detail_version_key(post_id))
+    if lists:
+        invalidate_post_lists()
+
+
+def invalidate_posts(post_ids: list[int]) -> None:
+    for post_id in post_ids:
+        bump_version(post_detail_version_key(post_id))
+    invalidate_post_lists()
+
+
+def invalidate_post_lists() -> None:
+    bump_version(POST_LIST_VERSION_KEY)
+
+
+def bump_version(key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+@contextmanager
+def _fill_lock(key: str) -> Iterator[None]:
+    # Locks are reference counted and dropped by the last user, so the map
+    # only holds keys that are being filled right now.
+    with _fill_locks_guard:
+        lock, users = _fill_locks.get(key, (None, 0))
+        if lock is None:
+            lock = threading.Lock()
+        _fill_locks[key] = (lock, users + 1)
+    try:
+        with lock:
+            yield
+    finally:
+        with _fill_locks_guard:
+            lock, users = _fill_locks[key]
+            if users == 1:
+                del _fill_locks[key]
+            else:
+                _fill_locks[key] = (lock, users - 1)
+
+
+def get_or_fill(key: str, fill: Callable[[], Any]) -> Any:
+    # One thread per process, and one process per key, fills the entry.
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    with _fill_lock(key):
+        value = cache.get(key)
+        if value is not None:
+            return value
+
+        lock_key = f"{key}:filling"
+        if cache.add(lock_key, 1, timeout=settings.RESPONSE_CACHE_FILL_TIMEOUT):
+            try:
+                value = fill()
+                cache.set(key, value, timeout=settings.RESPONSE_CACHE_TIMEOUT)
+            finally:
+                cache.delete(lock_key)
+            return value
+
+        deadline = time.monotonic() + settings.RESPONSE_CACHE_FILL_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            value = cache.get(key)
+            if value is not None:
+                return value
+        return fill()
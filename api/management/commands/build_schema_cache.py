@@ -0,0 +1,13 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from api.schema import write_schema_cache
+
+
+class Command(BaseCommand):
+    help = "Render the OpenAPI schema once and store it for the schema endpoint."  # noqa: A003
+
+    def handle(self, *_args: Any, **_options: Any) -> None:
+        for path in write_schema_cache():
+            self.stdout.write(f"Wrote {path}")
@@ -0,0 +1,46 @@
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+
+from api.warmup import warm_cache
+
+
+class Command(BaseCommand):
+    help = (  # noqa: A003
+        "Prefill the response cache with the hottest posts and the first list "
+        "pages, using parallel workers within a time budget."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--posts", type=int, default=settings.WARM_CACHE_POSTS)
+        parser.add_argument("--pages", type=int, default=settings.WARM_CACHE_PAGES)
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=settings.WARM_CACHE_PAGE_SIZE,
+        )
+        parser.add_argument("--workers", type=int, default=settings.WARM_CACHE_WORKERS)
+        parser.add_argument(
+            "--budget",
+            type=float,
+            default=settings.WARM_CACHE_BUDGET,
+            help="Stop starting new fills after this many seconds.",
+        )
+        parser.add_argument("--order", choices=["recent", "trending"], default="recent")
+        parser.add_argument("--host", default=None)
+
+    def handle(self, *_args: Any, **options: Any) -> None:
+        report = warm_cache(
+            post_limit=options["posts"],
+            pages=options["pages"],
+            page_size=options["page_size"],
+            workers=options["workers"],
+            budget=options["budget"],
+            order=options["order"],
+            host=options["host"],
+        )
+        self.stdout.write(
+            f"Warmed {len(report.warmed)} entries "
+            f"({len(report.failed)} failed, {report.skipped} skipped).",
+        )
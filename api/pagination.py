@@ -0,0 +1,33 @@
+from typing import Any
+
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+
+from blog.counting import EstimatedCountPaginator
+
+
+class EstimatedCountPagination(PageNumberPagination):
+    page_size = None
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    django_paginator_class = EstimatedCountPaginator
+
+    def get_paginated_response(self, data: Any) -> Response:
+        count_result = self.page.paginator.count_result
+        return Response(
+            {
+                "count": count_result.count,
+                "count_is_approximate": count_result.approximate,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            },
+        )
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        response_schema: dict = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count_is_approximate"] = {
+            "type": "boolean",
+            "example": False,
+        }
+        return response_schema
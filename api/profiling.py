@@ -0,0 +1,228 @@
+import cProfile
+import json
+import logging
+import random
+import re
+import time
+import uuid
+
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional, cast
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connection
+from django.http import HttpRequest, HttpResponse
+from django.utils import timezone
+from rest_framework import exceptions
+from rest_framework.request import Request
+
+from api.authentication import SignedTokenAuthentication
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "HTTP_X_PROFILE"
+PROFILE_ID_PATTERN = re.compile(r"^[0-9]{20}-[0-9a-f]{8}$")
+TOP_FUNCTIONS = 25
+
+
+class QueryTimeline:
+    def __init__(self, started: float) -> None:
+        self.started = started
+        self.queries: list[dict[str, Any]] = []
+        self.count = 0
+        self.total_ms = 0.0
+
+    def __call__(
+        self,
+        execute: Callable,
+        sql: str,
+        params: Any,
+        many: bool,  # noqa: FBT001
+        context: dict,
+    ) -> Any:
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            self.count += 1
+            self.total_ms += duration_ms
+            if len(self.queries) < settings.PROFILE_MAX_QUERIES:
+                self.queries.append(
+                    {
+                        "offset_ms": round((start - self.started) * 1000, 3),
+                        "duration_ms": round(duration_ms, 3),
+                        "sql": sql,
+                    },
+                )
+
+
+def profile_dir() -> Path:
+    return Path(settings.PROFILE_DIR)
+
+
+def profile_paths(profile_id: str) -> Optional[tuple[Path, Path]]:
+    if not PROFILE_ID_PATTERN.match(profile_id):
+        return None
+    directory = profile_dir()
+    return directory / f"{profile_id}.json", directory / f"{profile_id}.prof"
+
+
+def list_profiles() -> list[dict[str, Any]]:
+    summaries = []
+    for path in sorted(profile_dir().glob("*.json"), reverse=True):
+        try:
+            summary = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        summary.pop("queries", None)
+        summary.pop("functions", None)
+        summaries.append(summary)
+    return summaries
+
+
+def load_profile(profile_id: str) -> Optional[dict[str, Any]]:
+    paths = profile_paths(profile_id)
+    if paths is None or not paths[0].exists():
+        return None
+    summary: dict[str, Any] = json.loads(paths[0].read_text())
+    return summary
+
+
+def top_functions(profiler: cProfile.Profile) -> list[dict[str, Any]]:
+    profiler.create_stats()
+    rows: list[dict[str, Any]] = []
+    stats = profiler.stats
+    for (filename, line, name), (_, calls, total, cumulative, _) in stats.items():
+        rows.append(
+            {
+                "function": f"{filename}:{line}({name})",
+                "calls": calls,
+                "total_ms": round(total * 1000, 3),
+                "cumulative_ms": round(cumulative * 1000, 3),
+            },
+        )
+    rows.sort(key=lambda row: row["cumulative_ms"], reverse=True)
+    return rows[:TOP_FUNCTIONS]
+
+
+def save_profile(
+    request: HttpRequest,
+    response: HttpResponse,
+    profiler: cProfile.Profile,
+    timeline: QueryTimeline,
+    duration_ms: float,
+    trigger: str,
+) -> str:
+    now = timezone.now()
+    profile_id = f"{now:%Y%m%d%H%M%S%f}-{uuid.uuid4().hex[:8]}"
+    summary_path, stats_path = profile_paths(profile_id)  # type: ignore[misc]
+    summary_path.parent.mkdir(parents=True, exist_ok=True)
+
+    profiler.dump_stats(stats_path)
+    summary = {
+        "id": profile_id,
+        "created": now.isoformat(),
+        "method": request.method,
+        "path": request.get_full_path(),
+        "status": response.status_code,
+        "trigger": trigger,
+        "duration_ms": round(duration_ms, 3),
+        "query_count": timeline.count,
+        "query_ms": round(timeline.total_ms, 3),
+        "queries": timeline.queries,
+        "functions": top_functions(profiler),
+    }
+    summary_path.write_text(json.dumps(summary))
+    prune_profiles()
+    return profile_id
+
+
+def prune_profiles() -> None:
+    summaries = sorted(profile_dir().glob("*.json"), reverse=True)
+    for summary_path in summaries[settings.PROFILE_KEEP :]:
+        summary_path.unlink(missing_ok=True)
+        summary_path.with_suffix(".prof").unlink(missing_ok=True)
+
+
+def is_staff_request(request: HttpRequest) -> bool:
+    if request.user.is_authenticated:
+        return bool(getattr(request.user, "is_staff", False))
+    # API tokens are otherwise only resolved inside DRF views.
+    try:
+        resolved = SignedTokenAuthentication().authenticate(Request(request))
+    except exceptions.AuthenticationFailed:
+        return False
+    return bool(resolved and resolved[0].is_staff)
+
+
+def profiling_trigger(request: HttpRequest) -> Optional[str]:
+    requested = (
+        request.META.get(PROFILE_HEADER) == "1" or request.GET.get("profile") == "1"
+    )
+    if requested and is_staff_request(request):
+        return "requested"
+    if settings.PROFILE_SAMPLE_RATE and random.random() < settings.PROFILE_SAMPLE_RATE:
+        return "sampled"
+    return None
+
+
+class ProfilingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.profile(request)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        # Async requests are not profiled: cProfile would also time every other
+        # coroutine on the event loop. Passing them through keeps the ASGI
+        # chain async, so they are not funnelled through one sync thread.
+        return await cast(Awaitable[HttpResponse], self.get_response(request))
+
+    def profile(self, request: HttpRequest) -> HttpResponse:
+        trigger = profiling_trigger(request)
+        if trigger is None:
+            return self.get_response(request)
+
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        timeline = QueryTimeline(started)
+        try:
+            profiler.enable()
+        except ValueError:
+            # Only one profiler can be active per interpreter.
+            return self.get_response(request)
+
+        try:
+            with connection.execute_wrapper(timeline):
+                response = self.get_response(request)
+        finally:
+            profiler.disable()
+        duration_ms = (time.perf_counter() - started) * 1000
+
+        if trigger == "sampled" and duration_ms < settings.PROFILE_SLOW_THRESHOLD_MS:
+            return response
+        try:
+            profile_id = save_profile(
+                request,
+                response,
+                profiler,
+                timeline,
+                duration_ms,
+                trigger,
+            )
+        except OSError:
+            logger.exception("Could not store the profile of %s", request.path)
+            return response
+        response["X-Profile-Id"] = profile_id
+        return response
@@ -0,0 +1,106 @@
+import hashlib
+import os
+import threading
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.views import SCHEMA_KWARGS, SpectacularAPIView
+from rest_framework.renderers import BaseRenderer
+from rest_framework.request import Request
+
+SCHEMA_RENDERERS: dict[str, type[BaseRenderer]] = {
+    "yaml": OpenApiYamlRenderer,
+    "json": OpenApiJsonRenderer,
+}
+
+
+@dataclass(frozen=True)
+class SchemaDocument:
+    content: bytes
+    etag: str
+
+
+_documents: dict[str, SchemaDocument] = {}
+_lock = threading.RLock()
+
+
+def schema_cache_path(fmt: str) -> Path:
+    return Path(settings.SCHEMA_CACHE_DIR) / f"openapi.{fmt}"
+
+
+def render_schema() -> dict[str, bytes]:
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    schema = generator.get_schema(request=None, public=True)
+    return {
+        fmt: renderer().render(schema, renderer_context={})
+        for fmt, renderer in SCHEMA_RENDERERS.items()
+    }
+
+
+def write_schema_cache() -> list[Path]:
+    directory = Path(settings.SCHEMA_CACHE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    paths = []
+    for fmt, content in render_schema().items():
+        path = schema_cache_path(fmt)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(content)
+        tmp_path.replace(path)
+        paths.append(path)
+
+    clear_schema_documents()
+    return paths
+
+
+def clear_schema_documents() -> None:
+    with _lock:
+        _documents.clear()
+
+
+def get_schema_document(fmt: str) -> SchemaDocument:
+    document = _documents.get(fmt)
+    if document is not None:
+        return document
+
+    with _lock:
+        document = _documents.get(fmt)
+        if document is None:
+            path = schema_cache_path(fmt)
+            if not path.exists():
+                write_schema_cache()
+            content = path.read_bytes()
+            etag = f'"{hashlib.sha256(content).hexdigest()}"'
+            document = _documents[fmt] = SchemaDocument(content=content, etag=etag)
+    return document
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    # Rendered once per deploy and revalidated by clients with its ETag.
+    @extend_schema(**SCHEMA_KWARGS)
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> HttpResponse:
+        if settings.DEBUG or request.GET.get("lang") or request.GET.get("version"):
+            response: HttpResponse = super().get(request, *args, **kwargs)
+            return response
+
+        document = get_schema_document(request.accepted_renderer.format)
+
+        if document.etag in parse_etags(request.headers.get("If-None-Match", "")):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(
+                document.content,
+                content_type=request.accepted_media_type,
+            )
+        response["ETag"] = document.etag
+        max_age = settings.SCHEMA_CACHE_MAX_AGE
+        response["Cache-Control"] = f"public, max-age={max_age}, must-revalidate"
+        return response
@@ -1,6 +1,15 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.db.models import Manager
+from django.utils import timezone
 from rest_framework import serializers
 
-from blog.models import Author, Comment, Post
+from blog import PostStatus, tagging
+from blog.models import Author, Comment, Post, PostArchiveMonth, Tag, content_hash
+from blog.moderation import BlocklistMatcher, is_recent_duplicate
 
 
 class AuthorSerializer(serializers.ModelSerializer):
@@ -16,25 +25,111 @@ class CommentSerializer(serializers.ModelSerializer):
         model = Comment
         fields = ["id", "content", "user", "created"]
 
-    def validate_content(self, value):
+    def validate_content(self, value: str) -> str:
         if len(value) < 2:
             raise serializers.ValidationError("Comment must be at least 2 characters long.")
         if len(value) > 3000:
             raise serializers.ValidationError("Comment cannot exceed 3000 characters.")
+        if BlocklistMatcher.find(value) is not None:
+            raise serializers.ValidationError("Comment contains a blocked phrase.")
         return value
 
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        digest = content_hash(attrs["content"])
+        user = self.context["request"].user
+        user_id = user.pk if user.is_authenticated else None
+        if is_recent_duplicate(digest, self.context["post_id"], user_id):
+            raise serializers.ValidationError({"content": "Duplicate comment."})
+        attrs["content_hash"] = digest
+        return attrs
+
+
+class TagListField(serializers.ListField):
+    child = serializers.CharField(max_length=50)
+
+    def to_representation(self, tags: Manager[Tag]) -> list[str]:
+        return [tag.slug for tag in tags.all()]
+
+
+class TaggedPostSerializerMixin(serializers.ModelSerializer):
+    def create(self, validated_data: dict[str, Any]) -> Post:
+        names = validated_data.pop("tags", None)
+        post: Post = super().create(validated_data)
+        if names is not None:
+            post.tags.set(tagging.get_or_create_tags(names))
+        return post
+
+    def update(self, instance: Post, validated_data: dict[str, Any]) -> Post:
+        names = validated_data.pop("tags", None)
+        post: Post = super().update(instance, validated_data)
+        if names is not None:
+            post.tags.set(tagging.get_or_create_tags(names))
+        return post
+
+
+class ScheduledPostSerializerMixin(serializers.ModelSerializer):
+    def validate_publish_at(self, value: Optional[datetime]) -> Optional[datetime]:
+        if value is not None and value <= timezone.now():
+            raise serializers.ValidationError("Publish time must be in the future.")
+        return value
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        attrs = dict(super().validate(attrs))
+        post_status = attrs.get(
+            "status", self.instance.status if self.instance else PostStatus.DRAFT,
+        )
+        if post_status != PostStatus.DRAFT:
+            if attrs.get("publish_at") is not None:
+                raise serializers.ValidationError(
+                    {"publish_at": "Only drafts can be scheduled."},
+                )
+            # Publishing a scheduled draft by hand cancels the schedule.
+            attrs["publish_at"] = None
+        return attrs
+
+
+class TagSerializer(serializers.ModelSerializer):
+    count = serializers.IntegerField(source="post_count", read_only=True)
+
+    class Meta:
+        model = Tag
+        fields = ["name", "slug", "count"]
+
 
 class PostListSerializer(serializers.ModelSerializer):
     author_name = serializers.CharField(source="author.name", read_only=True)
+    views = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Post
-        fields = ["id", "title", "content", "published_date", "author_name", "active"]
+        fields = [
+            "id",
+            "title",
+            "content",
+            "published_date",
+            "author_name",
+            "active",
+            "views",
+        ]
 
 
-class PostDetailSerializer(serializers.ModelSerializer):
+class PostArchiveMonthSerializer(serializers.ModelSerializer):
+    count = serializers.IntegerField(source="post_count", read_only=True)
+
+    class Meta:
+        model = PostArchiveMonth
+        fields = ["year", "month", "count"]
+
+
+class PostDetailSerializer(
+    ScheduledPostSerializerMixin,
+    TaggedPostSerializerMixin,
+    serializers.ModelSerializer,
+):
     author_name = serializers.CharField(source="author.name", read_only=True)
     comments = CommentSerializer(many=True, read_only=True)
+    tags = TagListField(required=False, max_length=settings.TAGS_PER_POST_MAX)
+    views = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Post
@@ -46,19 +141,54 @@ class PostDetailSerializer(serializers.ModelSerializer):
             "author_name",
             "active",
             "status",
+            "publish_at",
+            "views",
+            "tags",
             "comments",
         ]
 
 
-class PostCreateSerializer(serializers.ModelSerializer):
+class PostCreateSerializer(
+    ScheduledPostSerializerMixin,
+    TaggedPostSerializerMixin,
+    serializers.ModelSerializer,
+):
     author_name = serializers.CharField(source="author.name", read_only=True)
+    tags = TagListField(required=False, max_length=settings.TAGS_PER_POST_MAX)
 
     class Meta:
         model = Post
-        fields = ["id", "title", "content","published_date", "author_name","status"]
+        fields = [
+            "id",
+            "title",
+            "content",
+            "published_date",
+            "author_name",
+            "status",
+            "publish_at",
+            "tags",
+        ]
 
 
     def validate_title(self, value):
         if Post.objects.filter(title__exact=value).exists():
             raise serializers.ValidationError("A post with this title already exists.")
         return value
+
+
+class TokenObtainSerializer(serializers.Serializer):
+    username = serializers.CharField()
+    password = serializers.CharField(write_only=True, style={"input_type": "password"})
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        user = authenticate(
+            request=self.context.get("request"),
+            username=attrs["username"],
+            password=attrs["password"],
+        )
+        if user is None:
+            raise serializers.ValidationError(
+                "Unable to log in with the provided credentials.",
+            )
+        attrs["user"] = user
+        return attrs
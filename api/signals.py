@@ -0,0 +1,54 @@
+from typing import Any
+
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from api import streams, tasks
+from api.authentication import forget_user_state
+from blog import scheduling
+from blog.models import Author, Comment, Post
+from blog.signals import comments_created
+
+
+@receiver([post_save, post_delete], sender=Post)
+def invalidate_post_responses(instance: Post, **_kwargs: Any) -> None:
+    tasks.invalidate_post.delay(instance.pk, lists=True)
+
+
+@receiver([post_save, post_delete], sender=Comment)
+def invalidate_comment_post_responses(
+    instance: Comment,
+    *,
+    created: bool = False,
+    **_kwargs: Any,
+) -> None:
+    # New comments are handled by comments_created.
+    if not created:
+        tasks.invalidate_post.delay(instance.post_id, lists=False)
+
+
+@receiver(comments_created)
+def publish_new_comments(
+    post_id: int,
+    comments: list[Comment],
+    **_kwargs: Any,
+) -> None:
+    tasks.invalidate_post.delay(post_id, lists=False)
+    streams.publish_comments(post_id, comments)
+
+
+@receiver(scheduling.posts_published)
+def invalidate_published_post_responses(post_ids: list[int], **_kwargs: Any) -> None:
+    for post_id in post_ids:
+        tasks.invalidate_post.delay(post_id, lists=True)
+
+
+@receiver([post_save, post_delete], sender=Author)
+def invalidate_author_responses(instance: Author, **_kwargs: Any) -> None:
+    tasks.invalidate_author.delay(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=User)
+def forget_token_user_state(instance: User, **_kwargs: Any) -> None:
+    forget_user_state(instance.pk)
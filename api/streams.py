@@ -0,0 +1,249 @@
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+
+from typing import Any, AsyncIterator, Iterable, Optional
+
+import psycopg2
+
+from django.conf import settings
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    close_old_connections,
+    connection,
+    connections,
+    transaction,
+)
+from django.utils.module_loading import import_string
+from psycopg2 import sql
+
+from api.serializers import CommentSerializer
+from blog.models import Comment
+
+logger = logging.getLogger(__name__)
+
+Event = dict[str, Any]
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more.
+NOTIFY_PAYLOAD_LIMIT = 7900
+
+
+class Subscriber:
+    def __init__(
+        self,
+        post_id: int,
+        loop: asyncio.AbstractEventLoop,
+        size: int,
+    ) -> None:
+        self.post_id = post_id
+        self.loop = loop
+        self.queue: asyncio.Queue[Event] = asyncio.Queue(maxsize=size)
+        self.dropped = 0
+
+    def put(self, event: Event) -> None:
+        # A slow client loses its oldest events instead of holding memory.
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+
+class CommentHub:
+    def __init__(self) -> None:
+        self._subscribers: dict[int, set[Subscriber]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(watchers) for watchers in self._subscribers.values())
+
+    def subscribe(
+        self,
+        post_id: int,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> Subscriber:
+        subscriber = Subscriber(
+            post_id,
+            loop or asyncio.get_running_loop(),
+            settings.STREAM_BUFFER_SIZE,
+        )
+        with self._lock:
+            self._subscribers.setdefault(post_id, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscriber.post_id)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[subscriber.post_id]
+
+    def publish(self, post_id: int, events: list[Event]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(post_id, ()))
+        for subscriber in subscribers:
+            for event in events:
+                try:
+                    subscriber.loop.call_soon_threadsafe(subscriber.put, event)
+                except RuntimeError:
+                    # The subscriber's loop has been closed.
+                    self.unsubscribe(subscriber)
+                    break
+
+
+hub = CommentHub()
+
+
+def comment_events(comments: Iterable[Comment]) -> list[Event]:
+    return [dict(CommentSerializer(comment).data) for comment in comments]
+
+
+def load_comment_events(comment_ids: list[int]) -> list[Event]:
+    comments = Comment.objects.filter(pk__in=comment_ids).select_related("user")
+    return comment_events(comments.order_by("id"))
+
+
+class LocalStreamBackend:
+    def start(self) -> None:
+        pass
+
+    def publish(self, post_id: int, events: list[Event]) -> None:
+        hub.publish(post_id, events)
+
+
+class PostgresStreamBackend:
+    # Every process serving streams relays NOTIFY to its local hub.
+    _listener: Optional[threading.Thread] = None
+    _lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            listener = PostgresStreamBackend._listener
+            if listener is None or not listener.is_alive():
+                listener = threading.Thread(
+                    target=self.listen,
+                    name="stream-listener",
+                    daemon=True,
+                )
+                listener.start()
+                PostgresStreamBackend._listener = listener
+
+    def publish(self, post_id: int, events: list[Event]) -> None:
+        payload = json.dumps({"post": post_id, "events": events})
+        if len(payload.encode()) > NOTIFY_PAYLOAD_LIMIT:
+            ids = [event["id"] for event in events]
+            payload = json.dumps({"post": post_id, "ids": ids})
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_notify(%s, %s)",
+                [settings.STREAM_CHANNEL, payload],
+            )
+
+    def listen(self) -> None:
+        while True:
+            try:
+                self.listen_once()
+            except Exception:
+                logger.exception("Comment stream listener failed; reconnecting")
+                time.sleep(1)
+
+    def listen_once(self) -> None:
+        params = connections[DEFAULT_DB_ALIAS].get_connection_params()
+        listen_connection = psycopg2.connect(**params)
+        listen_connection.set_isolation_level(
+            psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT,
+        )
+        try:
+            channel = sql.Identifier(settings.STREAM_CHANNEL)
+            with listen_connection.cursor() as cursor:
+                cursor.execute(sql.SQL("LISTEN {}").format(channel))
+            while True:
+                if select.select([listen_connection], [], [], 5) == ([], [], []):
+                    continue
+                listen_connection.poll()
+                while listen_connection.notifies:
+                    self.dispatch(listen_connection.notifies.pop(0).payload)
+        finally:
+            listen_connection.close()
+
+    def dispatch(self, payload: str) -> None:
+        message = json.loads(payload)
+        events = message.get("events")
+        if events is None:
+            try:
+                events = load_comment_events(message["ids"])
+            finally:
+                close_old_connections()
+        hub.publish(message["post"], events)
+
+
+def get_stream_backend() -> Any:
+    return import_string(settings.STREAM_BACKEND)()
+
+
+def publish_comments(post_id: int, comments: Iterable[Comment]) -> None:
+    events = comment_events(comments)
+    if not events:
+        return
+
+    def send() -> None:
+        try:
+            get_stream_backend().publish(post_id, events)
+        except Exception:
+            # Streaming is best effort; the comment itself is committed.
+            logger.exception("Could not publish comments of post %s", post_id)
+
+    transaction.on_commit(send)
+
+
+def format_event(event: Event) -> str:
+    return f"id: {event['id']}\nevent: comment\ndata: {json.dumps(event)}\n\n"
+
+
+async def missed_events(post_id: int, last_event_id: str) -> list[Event]:
+    try:
+        after = int(last_event_id)
+    except ValueError:
+        return []
+    comments = (
+        Comment.objects.filter(post_id=post_id, pk__gt=after)
+        .select_related("user")
+        .order_by("id")[: settings.STREAM_REPLAY_MAX]
+    )
+    return comment_events([comment async for comment in comments])
+
+
+async def event_stream(
+    post_id: int,
+    last_event_id: Optional[str],
+) -> AsyncIterator[str]:
+    # Subscribes only once the response is iterated, so a client that leaves
+    # earlier holds no slot, and before the backlog is read, so none is missed.
+    subscriber = hub.subscribe(post_id)
+    last_id = 0
+    try:
+        yield f"retry: {settings.STREAM_RETRY_MS}\n\n"
+        backlog = await missed_events(post_id, last_event_id) if last_event_id else []
+        for event in backlog:
+            last_id = event["id"]
+            yield format_event(event)
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscriber.queue.get(),
+                    timeout=settings.STREAM_HEARTBEAT,
+                )
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            # Comments replayed from the backlog may also arrive live.
+            if event["id"] > last_id:
+                last_id = event["id"]
+                yield format_event(event)
+    finally:
+        hub.unsubscribe(subscriber)
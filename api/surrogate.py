@@ -0,0 +1,84 @@
+import logging
+import threading
+import urllib.request
+
+from typing import Any, Iterable
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.module_loading import import_string
+from rest_framework.request import Request
+
+logger = logging.getLogger(__name__)
+
+SURROGATE_KEY_HEADER = "Surrogate-Key"
+POST_LIST_KEY = "posts"
+
+
+def post_key(post_id: Any) -> str:
+    return f"post-{post_id}"
+
+
+def author_key(author_id: Any) -> str:
+    return f"author-{author_id}"
+
+
+def is_shared_cacheable(request: Request) -> bool:
+    return (
+        request.method in ("GET", "HEAD")
+        and not request.user.is_authenticated
+        and "HTTP_AUTHORIZATION" not in request.META
+    )
+
+
+def tag_response(request: Request, response: HttpResponse, keys: Iterable[str]) -> None:
+    # Responses that depend on credentials stay private to the client.
+    for header in ("Authorization", "Cookie"):
+        patch_vary_headers(response, (header,))
+    if response.status_code != 200 or not is_shared_cacheable(request):  # noqa: PLR2004
+        patch_cache_control(response, private=True, no_cache=True)
+        return
+    patch_cache_control(response, public=True, max_age=settings.PROXY_CACHE_MAX_AGE)
+    response[SURROGATE_KEY_HEADER] = " ".join(sorted(keys))
+
+
+class NullPurgeBackend:
+    def purge(self, keys: list[str]) -> None:
+        pass
+
+
+class LocalPurgeBackend:
+    # For tests and local development.
+    purged: list[str] = []
+    _lock = threading.Lock()
+
+    def purge(self, keys: list[str]) -> None:
+        with self._lock:
+            LocalPurgeBackend.purged.extend(keys)
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls.purged = []
+
+
+class HTTPPurgeBackend:
+    def purge(self, keys: list[str]) -> None:
+        request = urllib.request.Request(  # noqa: S310
+            settings.CACHE_PURGE_URL,
+            method="PURGE",
+            headers={SURROGATE_KEY_HEADER: " ".join(keys)},
+        )
+        with urllib.request.urlopen(request, timeout=settings.CACHE_PURGE_TIMEOUT):  # noqa: S310
+            pass
+
+
+def get_purge_backend() -> Any:
+    return import_string(settings.CACHE_PURGE_BACKEND)()
+
+
+def purge(keys: Iterable[str]) -> None:
+    keys = sorted(set(keys))
+    if keys:
+        get_purge_backend().purge(keys)
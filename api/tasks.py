@@ -0,0 +1,22 @@
+from api import cache as response_cache
+from api import surrogate
+from blog.models import Post
+from tasks.runner import task
+
+
+@task(dedupe=True)
+def invalidate_post(post_id: int, *, lists: bool) -> None:
+    response_cache.invalidate_post(post_id, lists=lists)
+    keys = [surrogate.post_key(post_id)]
+    if lists:
+        keys.append(surrogate.POST_LIST_KEY)
+    surrogate.purge(keys)
+
+
+@task(dedupe=True)
+def invalidate_author(author_id: int) -> None:
+    post_ids = list(
+        Post.objects.filter(author_id=author_id).values_list("id", flat=True),
+    )
+    response_cache.invalidate_posts(post_ids)
+    surrogate.purge([surrogate.author_key(author_id)])
@@ -1,7 +1,18 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from api.views import CommentCreateAPIView, PostViewSet
+from api.views import (
+    CommentBulkCreateAPIView,
+    CommentCreateAPIView,
+    CommentStreamView,
+    PostViewSet,
+    ProfileDetailAPIView,
+    ProfileDownloadAPIView,
+    ProfileListAPIView,
+    TagCloudAPIView,
+    TokenObtainAPIView,
+    TokenRevokeAPIView,
+)
 
 router = DefaultRouter()
 router.register(r"posts", PostViewSet, basename="post")
@@ -13,4 +24,28 @@ urlpatterns = [
         CommentCreateAPIView.as_view(),
         name="post-comment-create",
     ),
+    path(
+        "posts/<int:post_pk>/comments/bulk/",
+        CommentBulkCreateAPIView.as_view(),
+        name="post-comment-bulk-create",
+    ),
+    path(
+        "posts/<int:post_pk>/comments/stream/",
+        CommentStreamView.as_view(),
+        name="post-comment-stream",
+    ),
+    path("tags/", TagCloudAPIView.as_view(), name="tag-cloud"),
+    path("auth/token/", TokenObtainAPIView.as_view(), name="token-obtain"),
+    path("auth/token/revoke/", TokenRevokeAPIView.as_view(), name="token-revoke"),
+    path("profiles/", ProfileListAPIView.as_view(), name="profile-list"),
+    path(
+        "profiles/<str:profile_id>/",
+        ProfileDetailAPIView.as_view(),
+        name="profile-detail",
+    ),
+    path(
+        "profiles/<str:profile_id>/download/",
+        ProfileDownloadAPIView.as_view(),
+        name="profile-download",
+    ),
 ]
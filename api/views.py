@@ -1,13 +1,26 @@
-from typing import Type
+from datetime import MAXYEAR
+from typing import Any, Type
 
 import django_filters
 
+from django.conf import settings
 from django.contrib.auth.models import User
-from django.db.models import QuerySet
+from django.db.models import Prefetch, QuerySet
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpRequest,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.http.response import HttpResponseBase
+from django.views import View
 from django_filters.rest_framework import (
+    BaseInFilter,
     DateFromToRangeFilter,
     DjangoFilterBackend,
     FilterSet,
+    NumberFilter,
 )
 from rest_framework import (
     exceptions,
@@ -17,16 +30,34 @@ from rest_framework import (
     status,
     viewsets,
 )
+from rest_framework.decorators import action
+from rest_framework.filters import OrderingFilter
+from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.throttling import UserRateThrottle
+from rest_framework.views import APIView
 
+from api import cache as response_cache
+from api import profiling, streams, surrogate, warmup
+from api.authentication import TokenDenyList, issue_token
+from api.pagination import EstimatedCountPagination
 from api.permissions import IsAuthorOrReadOnly
 from api.serializers import (
     CommentSerializer,
+    PostArchiveMonthSerializer,
     PostCreateSerializer,
     PostDetailSerializer,
     PostListSerializer,
+    TagSerializer,
+    TokenObtainSerializer,
 )
-from blog.models import Author, Comment, Post
+from blog import archive, related, tagging, trending, viewcounts
+from blog.models import Author, Comment, Post, PostArchiveMonth
+from blog.signals import comments_created
+
+
+class NumberInFilter(BaseInFilter, NumberFilter):
+    pass
 
 
 class PostFilter(FilterSet):
@@ -36,46 +67,236 @@ class PostFilter(FilterSet):
         lookup_expr="icontains",
     )
     title = django_filters.CharFilter(lookup_expr="icontains")
+    ids = NumberInFilter(field_name="id", method="filter_ids")
+    tags = django_filters.CharFilter(method="filter_tags")
+    tags_match = django_filters.ChoiceFilter(
+        choices=[(tagging.MATCH_ANY, "Any"), (tagging.MATCH_ALL, "All")],
+        method="filter_tags_match",
+    )
 
     class Meta:
         model = Post
-        fields = ["title", "author_name", "published_date"]
+        fields = ["title", "author_name", "published_date", "ids", "tags", "tags_match"]
+
+    def filter_ids(self, queryset: QuerySet[Post], name: str, value: list) -> QuerySet:
+        if len(value) > settings.POST_BATCH_MAX_SIZE:
+            raise exceptions.ValidationError(
+                {"ids": f"At most {settings.POST_BATCH_MAX_SIZE} ids are allowed."},
+            )
+        return queryset.filter(**{f"{name}__in": value})
+
+    def filter_tags(self, queryset: QuerySet[Post], _name: str, value: str) -> QuerySet:
+        slugs = [slug.strip() for slug in value.split(",") if slug.strip()]
+        if len(slugs) > settings.TAGS_FILTER_MAX:
+            raise exceptions.ValidationError(
+                {"tags": f"At most {settings.TAGS_FILTER_MAX} tags are allowed."},
+            )
+        if not slugs:
+            return queryset
+        match = self.form.cleaned_data.get("tags_match") or tagging.MATCH_ANY
+        return tagging.filter_by_tags(queryset, slugs, match)
+
+    def filter_tags_match(self, queryset: QuerySet[Post], *_args: Any) -> QuerySet:
+        # Only modifies how `tags` is applied.
+        return queryset
+
+
+class PostOrderingFilter(OrderingFilter):
+    def get_ordering(self, request: Request, queryset: QuerySet, view: Any) -> Any:
+        # Ties are broken by id, so pages stay stable.
+        ordering = super().get_ordering(request, queryset, view)
+        if ordering and "-id" not in ordering and "id" not in ordering:
+            ordering = [*ordering, "-id"]
+        return ordering
 
 
 class PostViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthorOrReadOnly]
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = [DjangoFilterBackend, PostOrderingFilter]
     filterset_class = PostFilter
+    ordering_fields = ["views", "id"]
+    pagination_class = EstimatedCountPagination
+    lookup_value_regex = r"\d+"
 
-    def get_queryset(self) -> QuerySet[Post]:
+    def get_queryset(self) -> QuerySet[Post] | QuerySet[PostArchiveMonth]:
         queryset: QuerySet = Post.objects.all()
         if self.action == "list":
-            return queryset.filter(active=True).select_related("author")
+            return queryset.filter(active=True).select_related("author").order_by("-id")
+        if self.action == "trending":
+            return trending.trending_posts(self.get_trending_limit())
+        if self.action == "archive":
+            return archive.archive_months()
+        if self.action == "archive_month":
+            return archive.archived_posts(*self.get_archive_month())
         if self.action == "retrieve":
-            return queryset.select_related("author").prefetch_related("comments")
+            return queryset.select_related("author").prefetch_related(
+                "tags",
+                Prefetch(
+                    "comments",
+                    queryset=Comment.objects.select_related("user").order_by("id"),
+                ),
+            )
         return queryset
 
     def get_serializer_class(
         self,
-    ) -> Type[PostListSerializer | PostDetailSerializer | PostCreateSerializer]:
-        if self.action == "list":
+    ) -> Type[
+        PostListSerializer
+        | PostDetailSerializer
+        | PostCreateSerializer
+        | PostArchiveMonthSerializer
+    ]:
+        if self.action in ("list", "trending", "archive_month", "related"):
             return PostListSerializer
+        if self.action == "archive":
+            return PostArchiveMonthSerializer
         if self.action == "create":
             return PostCreateSerializer
         return PostDetailSerializer
 
+    def initial(self, request: Request, *args: Any, **kwargs: Any) -> None:
+        super().initial(request, *args, **kwargs)
+        self.surrogate_keys: set[str] = set()
+        if not self.detail:
+            self.surrogate_keys.add(surrogate.POST_LIST_KEY)
+
+    def get_serializer(self, *args: Any, **kwargs: Any) -> serializers.BaseSerializer:
+        if args and self.request.method == "GET":
+            self.add_surrogate_keys(args[0])
+        return super().get_serializer(*args, **kwargs)
+
+    def add_surrogate_keys(self, instance: Any) -> None:
+        posts = [instance] if isinstance(instance, Post) else instance
+        for post in posts:
+            if isinstance(post, Post):
+                self.surrogate_keys.add(surrogate.post_key(post.pk))
+                self.surrogate_keys.add(surrogate.author_key(post.author_id))
+
+    def finalize_response(
+        self,
+        request: Request,
+        response: Response,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Response:
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if request.method in ("GET", "HEAD"):
+            keys = getattr(self, "surrogate_keys", ())
+            surrogate.tag_response(request, response, keys)
+        return response
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:  # noqa: A003
+        key = response_cache.post_list_key(
+            request.get_host(),
+            dict(request.query_params.lists()),
+        )
+        return self.cached_response(key, super().list, request, *args, **kwargs)
+
+    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        key = response_cache.post_detail_key(kwargs["pk"])
+        response = self.cached_response(key, super().retrieve, request, *args, **kwargs)
+        # Counted after the cache lookup, so cache hits count too.
+        if request.method == "GET" and not warmup.is_warmup_request(request):
+            viewcounts.record_view(response.data["id"])
+        return response
+
+    def cached_response(
+        self,
+        key: str,
+        view: Any,
+        request: Request,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Response:
+        if not settings.RESPONSE_CACHE_ENABLED:
+            return view(request, *args, **kwargs)
+
+        def fill() -> dict[str, Any]:
+            data = view(request, *args, **kwargs).data
+            return {"data": data, "surrogate_keys": sorted(self.surrogate_keys)}
+
+        entry = response_cache.get_or_fill(key, fill)
+        self.surrogate_keys = set(entry["surrogate_keys"])
+        return Response(entry["data"])
+
     def perform_create(self, serializer: serializers.ModelSerializer) -> None:
         if not self.request.user.is_authenticated:
             raise exceptions.PermissionDenied("You must be logged in to create a post.")
 
         try:
-            author: Author = Author.objects.get(user=self.request.user)
+            author: Author = self.get_author()
             serializer.save(author=author)
         except Author.DoesNotExist as err:
             raise exceptions.PermissionDenied(
                 "You do not have an author profile to create a post.",
             ) from err
 
+    @action(detail=False, methods=["get"])
+    def trending(self, _request: Request) -> Response:
+        serializer = self.get_serializer(self.get_queryset(), many=True)
+        return Response(serializer.data)
+
+    def get_trending_limit(self) -> int:
+        try:
+            limit = int(self.request.query_params.get("limit", 10))
+        except ValueError as err:
+            raise exceptions.ValidationError({"limit": "Must be an integer."}) from err
+        return max(1, min(limit, int(settings.TRENDING_MAX_LIMIT)))
+
+    @action(detail=True, methods=["get"])
+    def related(self, _request: Request, pk: str) -> Response:
+        posts = related.related_posts(int(pk))
+        if not posts and not Post.objects.filter(pk=pk).exists():
+            raise Http404
+        self.surrogate_keys.add(surrogate.post_key(pk))
+        return Response(self.get_serializer(posts, many=True).data)
+
+    @action(detail=False, methods=["get"])
+    def archive(self, _request: Request) -> Response:
+        serializer = self.get_serializer(self.get_queryset(), many=True)
+        return Response(serializer.data)
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path=r"archive/(?P<year>\d{4})/(?P<month>\d{1,2})",
+        url_name="archive-month",
+    )
+    def archive_month(self, _request: Request, **_kwargs: Any) -> Response:
+        queryset = self.get_queryset()
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        return Response(self.get_serializer(queryset, many=True).data)
+
+    def get_archive_month(self) -> tuple[int, int]:
+        year, month = int(self.kwargs["year"]), int(self.kwargs["month"])
+        # Months of the last representable year have no exclusive upper bound.
+        if not 1 <= year < MAXYEAR or not 1 <= month <= 12:  # noqa: PLR2004
+            raise Http404
+        return year, month
+
+    def get_author(self) -> Author:
+        claims = self.request.auth
+        if isinstance(claims, dict):
+            if claims.get("aid") is None:
+                raise Author.DoesNotExist
+            return Author.objects.get(pk=claims["aid"])
+        return Author.objects.get(user=self.request.user)
+
+
+class TagCloudAPIView(generics.ListAPIView):
+    serializer_class = TagSerializer
+    permission_classes = [permissions.AllowAny]
+
+    def get_queryset(self) -> QuerySet:
+        try:
+            limit = int(self.request.query_params.get("limit", 50))
+        except ValueError as err:
+            raise exceptions.ValidationError({"limit": "Must be an integer."}) from err
+        return tagging.tag_cloud(max(1, min(limit, settings.TAGS_CLOUD_MAX)))
+
 
 class CommentCreateAPIView(generics.CreateAPIView):
     queryset = Comment.objects.all()
@@ -83,6 +304,30 @@ class CommentCreateAPIView(generics.CreateAPIView):
     permission_classes = [permissions.AllowAny]
 
     def create(self, request: Response, **_kwargs: dict) -> Response:
+        post = self.get_post_or_error()
+        if isinstance(post, Response):
+            return post
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        user: User = request.user if request.user.is_authenticated else None
+        serializer.save(post=post, user=user)
+
+        headers: dict[str, str] = self.get_success_headers(serializer.data)
+
+        return Response(
+            serializer.data,
+            status=status.HTTP_201_CREATED,
+            headers=headers,
+        )
+
+    def get_serializer_context(self) -> dict[str, Any]:
+        context: dict[str, Any] = super().get_serializer_context()
+        context["post_id"] = self.kwargs["post_pk"]
+        return context
+
+    def get_post_or_error(self) -> Post | Response:
         post_id: int = self.kwargs.get("post_pk")
         try:
             post: Post = Post.objects.get(pk=post_id)
@@ -97,17 +342,163 @@ class CommentCreateAPIView(generics.CreateAPIView):
                 {"error": "Cannot comment on an inactive post."},
                 status=status.HTTP_403_FORBIDDEN,
             )
+        return post
+
+
+class CommentBulkThrottle(UserRateThrottle):
+    scope = "comment_bulk"
+
+    def get_rate(self) -> str:
+        return str(settings.COMMENT_BULK_THROTTLE_RATE)
+
+
+class CommentBulkCreateAPIView(CommentCreateAPIView):
+    permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [CommentBulkThrottle]
+
+    def create(self, request: Response, **_kwargs: dict) -> Response:
+        post = self.get_post_or_error()
+        if isinstance(post, Response):
+            return post
+
+        items = request.data
+        if not isinstance(items, list):
+            return Response(
+                {"error": "Expected a list of comments."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        max_size = settings.COMMENT_BULK_MAX_SIZE
+        if len(items) > max_size:
+            return Response(
+                {"error": f"At most {max_size} comments are allowed."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        user: User = request.user
+        comments: list[Comment] = []
+        errors: list[dict] = []
+        seen: set[str] = set()
+        for index, item in enumerate(items):
+            serializer = self.get_serializer(data=item)
+            if not serializer.is_valid():
+                errors.append({"index": index, "errors": serializer.errors})
+            elif serializer.validated_data["content_hash"] in seen:
+                duplicate = {"content": ["Duplicate comment."]}
+                errors.append({"index": index, "errors": duplicate})
+            else:
+                seen.add(serializer.validated_data["content_hash"])
+                comments.append(
+                    Comment(post=post, user=user, **serializer.validated_data),
+                )
+
+        created: list[Comment] = Comment.objects.bulk_create(comments)
+        if created:
+            comments_created.send(sender=Comment, post_id=post.pk, comments=created)
+
+        if not created:
+            response_status = status.HTTP_400_BAD_REQUEST
+        elif errors:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_201_CREATED
+
+        return Response(
+            {
+                "created": self.get_serializer(created, many=True).data,
+                "errors": errors,
+            },
+            status=response_status,
+        )
+
+
+class CommentStreamView(View):
+    # DRF views are synchronous and would hold a worker thread per client.
+    http_method_names = ["get"]
+
+    async def get(self, request: HttpRequest, post_pk: int) -> HttpResponseBase:
+        if not await Post.objects.filter(pk=post_pk, active=True).aexists():
+            return JsonResponse(
+                {"error": "Post not found."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        if streams.hub.subscriber_count >= settings.STREAM_MAX_SUBSCRIBERS:
+            return JsonResponse(
+                {"error": "Too many open streams."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+
+        streams.get_stream_backend().start()
+        response = StreamingHttpResponse(
+            streams.event_stream(post_pk, request.headers.get("Last-Event-ID")),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+
+class TokenObtainAPIView(generics.GenericAPIView):
+    serializer_class = TokenObtainSerializer
+    permission_classes = [permissions.AllowAny]
+    authentication_classes: list = []
 
+    def post(self, request: Request) -> Response:
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        user: User = request.user if request.user.is_authenticated else None
-        serializer.save(post=post, user=user)
-
-        headers: dict[str, str] = self.get_success_headers(serializer.data)
+        user: User = serializer.validated_data["user"]
+        author_id: int | None = (
+            Author.objects.filter(user=user).values_list("id", flat=True).first()
+        )
+        token, claims = issue_token(user, author_id)
 
         return Response(
-            serializer.data,
+            {"token": token, "expires": claims["exp"]},
             status=status.HTTP_201_CREATED,
-            headers=headers,
+        )
+
+
+class TokenRevokeAPIView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request: Request) -> Response:
+        if not isinstance(request.auth, dict):
+            return Response(
+                {"error": "Only API tokens can be revoked."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        TokenDenyList.revoke(request.auth)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ProfileListAPIView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, _request: Request) -> Response:
+        return Response(profiling.list_profiles())
+
+
+class ProfileDetailAPIView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, _request: Request, profile_id: str) -> Response:
+        summary = profiling.load_profile(profile_id)
+        if summary is None:
+            raise Http404
+        return Response(summary)
+
+
+class ProfileDownloadAPIView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, _request: Request, profile_id: str) -> FileResponse:
+        paths = profiling.profile_paths(profile_id)
+        if paths is None or not paths[1].exists():
+            raise Http404
+        return FileResponse(
+            paths[1].open("rb"),
+            as_attachment=True,
+            filename=paths[1].name,
+            content_type="application/octet-stream",
         )
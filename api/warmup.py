@@ -0,0 +1,152 @@
+import logging
+import threading
+import time
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import HttpRequest, QueryDict
+from django.http.response import HttpResponseBase
+from django.urls import resolve, reverse
+
+from blog.models import Post
+
+logger = logging.getLogger(__name__)
+
+finished = threading.Event()
+
+# An environ key rather than a header, so clients cannot set it.
+WARMUP_ENVIRON_KEY = "blog_system.warmup"
+
+
+@dataclass
+class WarmupReport:
+    warmed: list[str] = field(default_factory=list)
+    failed: list[str] = field(default_factory=list)
+    skipped: int = 0
+
+
+def hot_post_ids(limit: int, order: str) -> list[int]:
+    queryset = Post.objects.filter(active=True)
+    if order == "trending":
+        queryset = queryset.order_by("-trending_score", "-id")
+    else:
+        queryset = queryset.order_by("-id")
+    return list(queryset.values_list("id", flat=True)[:limit])
+
+
+def warmup_urls(post_ids: list[int], pages: int, page_size: int) -> list[str]:
+    list_url = reverse("post-list")
+    urls = [
+        f"{list_url}?page={page}&page_size={page_size}" for page in range(1, pages + 1)
+    ]
+    urls += [reverse("post-detail", kwargs={"pk": post_id}) for post_id in post_ids]
+    return urls
+
+
+def fetch(url: str, host: str) -> bool:
+    path, _, query = url.partition("?")
+    request = HttpRequest()
+    request.method = "GET"
+    request.path = request.path_info = path
+    request.GET = QueryDict(query)
+    request.META = {
+        "HTTP_HOST": host,
+        "SERVER_NAME": host,
+        "SERVER_PORT": "80",
+        WARMUP_ENVIRON_KEY: True,
+    }
+
+    match = resolve(path)
+    try:
+        response: HttpResponseBase = match.func(request, *match.args, **match.kwargs)
+    finally:
+        close_old_connections()
+    return response.status_code == 200  # noqa: PLR2004
+
+
+def is_warmup_request(request: HttpRequest) -> bool:
+    return bool(request.META.get(WARMUP_ENVIRON_KEY))
+
+
+def warm_cache(
+    post_limit: int,
+    pages: int,
+    page_size: int,
+    workers: int,
+    budget: float,
+    order: str = "recent",
+    host: Optional[str] = None,
+) -> WarmupReport:
+    try:
+        return _warm(post_limit, pages, page_size, workers, budget, order, host)
+    finally:
+        finished.set()
+
+
+def _warm(
+    post_limit: int,
+    pages: int,
+    page_size: int,
+    workers: int,
+    budget: float,
+    order: str,
+    host: Optional[str],
+) -> WarmupReport:
+    deadline = time.monotonic() + budget
+    host = host or settings.WARM_CACHE_HOST
+    urls = warmup_urls(hot_post_ids(post_limit, order), pages, page_size)
+    report = WarmupReport()
+
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="warmup")
+    pending: dict[Future, str] = {}
+    try:
+        for url in urls:
+            while len(pending) >= workers:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    _record(report, pending.pop(future), future)
+            if time.monotonic() >= deadline:
+                break
+            pending[executor.submit(fetch, url, host)] = url
+
+        done, _ = wait(pending, timeout=max(deadline - time.monotonic(), 0))
+        for future in done:
+            _record(report, pending.pop(future), future)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    report.skipped = len(urls) - len(report.warmed) - len(report.failed)
+    return report
+
+
+def _record(report: WarmupReport, url: str, future: Future) -> None:
+    try:
+        succeeded = future.result()
+    except Exception:
+        logger.exception("Cache warm-up failed for %s", url)
+        succeeded = False
+    (report.warmed if succeeded else report.failed).append(url)
+
+
+def warm_cache_in_background() -> threading.Thread:
+    thread = threading.Thread(
+        target=warm_cache,
+        kwargs={
+            "post_limit": settings.WARM_CACHE_POSTS,
+            "pages": settings.WARM_CACHE_PAGES,
+            "page_size": settings.WARM_CACHE_PAGE_SIZE,
+            "workers": settings.WARM_CACHE_WORKERS,
+            "budget": settings.WARM_CACHE_BUDGET,
+        },
+        name="warmup",
+        daemon=True,
+    )
+    thread.start()
+    return thread
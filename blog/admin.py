@@ -1,7 +1,63 @@
 from django.contrib import admin
+from django.db.models import QuerySet
+from django.http import HttpRequest
 
-from blog.models import Author, Comment, Post
+from blog.counting import EstimatedCountPaginator
+from blog.models import Author, BlockedPhrase, Comment, Post, Tag
 
-admin.site.register(Author)
-admin.site.register(Post)
-admin.site.register(Comment)
+
+class ScalableModelAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    ordering = ["-id"]
+
+    def get_search_results(
+        self,
+        request: HttpRequest,
+        queryset: QuerySet,
+        search_term: str,
+    ) -> tuple[QuerySet, bool]:
+        # Casting the id column to text for the default search defeats its index.
+        if search_term.strip().isdigit():
+            return queryset.filter(pk=int(search_term)), False
+        return super().get_search_results(request, queryset, search_term)
+
+
+@admin.register(Author)
+class AuthorAdmin(ScalableModelAdmin):
+    list_display = ["id", "name", "email", "user"]
+    list_select_related = ["user"]
+    raw_id_fields = ["user"]
+    search_fields = ["email__exact", "name__startswith"]
+
+
+@admin.register(Post)
+class PostAdmin(ScalableModelAdmin):
+    list_display = ["id", "title", "author", "status", "active", "published_date"]
+    list_filter = ["status", "active"]
+    list_select_related = ["author"]
+    autocomplete_fields = ["author"]
+    search_fields = ["title__startswith"]
+
+
+@admin.register(Comment)
+class CommentAdmin(ScalableModelAdmin):
+    list_display = ["id", "__str__", "created"]
+    list_select_related = ["post", "user"]
+    autocomplete_fields = ["post"]
+    raw_id_fields = ["user"]
+    search_fields = ["user__username__startswith"]
+
+
+@admin.register(BlockedPhrase)
+class BlockedPhraseAdmin(ScalableModelAdmin):
+    list_display = ["id", "phrase", "created"]
+    search_fields = ["phrase__startswith"]
+
+
+@admin.register(Tag)
+class TagAdmin(ScalableModelAdmin):
+    list_display = ["id", "name", "slug", "post_count"]
+    prepopulated_fields = {"slug": ["name"]}
+    readonly_fields = ["post_count"]
+    search_fields = ["slug__startswith"]
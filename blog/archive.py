@@ -0,0 +1,73 @@
+from collections import Counter
+from datetime import datetime
+
+from django.db import connection
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from blog import PostStatus
+from blog.models import Post, PostArchiveMonth
+
+ArchiveState = tuple[int, int] | None
+
+
+def adjust_months(deltas: Counter[tuple[int, int]]) -> None:
+    # A single upsert, so concurrent writers cannot race on a month's first post.
+    table = PostArchiveMonth._meta.db_table  # noqa: SLF001
+    increments = [
+        (year, month, delta) for (year, month), delta in deltas.items() if delta > 0
+    ]
+    decrements = [
+        (-delta, year, month) for (year, month), delta in deltas.items() if delta < 0
+    ]
+    with connection.cursor() as cursor:
+        if increments:
+            placeholders = ", ".join(["(%s, %s, %s)"] * len(increments))
+            cursor.execute(
+                f"INSERT INTO {table} (year, month, post_count) VALUES {placeholders} "  # noqa: S608
+                f"ON CONFLICT (year, month) DO UPDATE "
+                f"SET post_count = {table}.post_count + EXCLUDED.post_count",
+                [value for row in increments for value in row],
+            )
+        if decrements:
+            cursor.executemany(
+                f"UPDATE {table} SET post_count = GREATEST(post_count - %s, 0) "  # noqa: S608
+                f"WHERE year = %s AND month = %s",
+                decrements,
+            )
+
+
+def record_transition(before: ArchiveState, after: ArchiveState) -> None:
+    if before == after:
+        return
+    deltas: Counter[tuple[int, int]] = Counter()
+    if before is not None:
+        deltas[before] -= 1
+    if after is not None:
+        deltas[after] += 1
+    adjust_months(deltas)
+
+
+def archive_months() -> QuerySet[PostArchiveMonth]:
+    return PostArchiveMonth.objects.filter(post_count__gt=0).order_by("-year", "-month")
+
+
+def month_bounds(year: int, month: int) -> tuple[datetime, datetime]:
+    tz = timezone.get_current_timezone()
+    start = datetime(year, month, 1, tzinfo=tz)
+    end = datetime(year + month // 12, month % 12 + 1, 1, tzinfo=tz)
+    return start, end
+
+
+def archived_posts(year: int, month: int) -> QuerySet[Post]:
+    start, end = month_bounds(year, month)
+    return (
+        Post.objects.filter(
+            status=PostStatus.PUBLISHED,
+            active=True,
+            published_date__gte=start,
+            published_date__lt=end,
+        )
+        .select_related("author")
+        .order_by("-published_date", "-id")
+    )
@@ -0,0 +1,46 @@
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from blog import related
+
+
+class Command(BaseCommand):
+    help = (  # noqa: A003
+        "Precompute the related-posts table from hashed title/content vectors. "
+        "Run with --incremental often (e.g. every few minutes from cron) to add "
+        "new posts, and without it periodically to pick up edits and removals."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="Only add posts that have not been vectorized yet.",
+        )
+        parser.add_argument("--k", type=int, default=settings.RELATED_POSTS_K)
+        parser.add_argument(
+            "--block-size",
+            type=int,
+            default=settings.RELATED_POSTS_BLOCK_SIZE,
+            help="Number of posts compared against the whole corpus at once.",
+        )
+
+    def handle(self, *_args: Any, **options: Any) -> None:
+        k: int = options["k"]
+        block_size: int = options["block_size"]
+        if k < 1 or block_size < 1:
+            raise CommandError("--k and --block-size must be positive.")
+
+        build = related.build_all
+        if options["incremental"]:
+            build = related.build_incremental
+        try:
+            report = build(k, block_size)
+        except ValueError as err:
+            raise CommandError(str(err)) from err
+        self.stdout.write(
+            f"Vectorized {report.vectorized} posts and updated the related "
+            f"posts of {report.updated}.",
+        )
@@ -0,0 +1,26 @@
+from typing import Any, Optional
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from blog import trending
+
+
+class Command(BaseCommand):
+    help = (  # noqa: A003
+        "Multiply every trending score by a decay factor. Run periodically "
+        "(e.g. hourly from cron) so older activity counts for less."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--factor", type=float, default=None)
+
+    def handle(self, *_args: Any, **options: Any) -> None:
+        factor: Optional[float] = options["factor"]
+        if factor is None:
+            factor = settings.TRENDING_DECAY_FACTOR
+        if not 0 < factor < 1:
+            raise CommandError("--factor must be between 0 and 1.")
+
+        decayed = trending.decay_scores(factor)
+        self.stdout.write(f"Decayed {decayed} trending scores by {factor}.")
@@ -0,0 +1,47 @@
+from typing import Any
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from blog_system.health import has_pending_migrations
+
+# Advisory lock key shared by every replica of the service.
+MIGRATION_LOCK_ID = 7_402_519
+
+
+class Command(BaseCommand):
+    help = (  # noqa: A003
+        "Apply pending migrations under a Postgres advisory lock. "
+        "Exits immediately when the database is already up to date."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+        parser.add_argument("--lock-id", type=int, default=MIGRATION_LOCK_ID)
+
+    def handle(self, *_args: Any, **options: Any) -> None:
+        database: str = options["database"]
+        lock_id: int = options["lock_id"]
+        connection = connections[database]
+
+        if not has_pending_migrations(connection):
+            self.stdout.write("No migrations to apply.")
+            return
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_lock(%s)", [lock_id])
+        try:
+            if not has_pending_migrations(connection):
+                self.stdout.write("Migrations were applied by another process.")
+                return
+            call_command(
+                "migrate",
+                database=database,
+                interactive=False,
+                verbosity=options["verbosity"],
+                stdout=self.stdout,
+            )
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_unlock(%s)", [lock_id])
@@ -0,0 +1,44 @@
+import time
+
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from blog import scheduling
+
+
+class Command(BaseCommand):
+    help = (  # noqa: A003
+        "Publish drafts whose publish_at has passed. Run every minute from cron, "
+        "or keep it running with --interval; several copies may run at once."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.PUBLISH_DUE_BATCH_SIZE,
+            help="Number of posts claimed and published per transaction.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=None,
+            help="Keep running, checking for due posts every this many seconds.",
+        )
+
+    def handle(self, *_args: Any, **options: Any) -> None:
+        batch_size: int = options["batch_size"]
+        interval: float | None = options["interval"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be positive.")
+        if interval is not None and interval <= 0:
+            raise CommandError("--interval must be positive.")
+
+        while True:
+            published = scheduling.publish_due(batch_size)
+            self.stdout.write(f"Published {published} scheduled posts.")
+            if interval is None:
+                return
+            time.sleep(interval)
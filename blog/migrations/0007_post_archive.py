@@ -0,0 +1,53 @@
+# Generated by Django 5.2.3 on 2026-10-19 18:49
+
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db.migrations.state import StateApps
+from django.db.models import Count
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+
+def backfill_archive_months(
+    apps: StateApps, schema_editor: BaseDatabaseSchemaEditor,
+) -> None:
+    Post = apps.get_model('blog', 'Post')
+    PostArchiveMonth = apps.get_model('blog', 'PostArchiveMonth')
+    months = (
+        Post.objects.filter(status='published', active=True)
+        .annotate(year=ExtractYear('published_date'), month=ExtractMonth('published_date'))
+        .values('year', 'month')
+        .annotate(post_count=Count('id'))
+        .order_by()
+    )
+    PostArchiveMonth.objects.bulk_create(
+        PostArchiveMonth(year=row['year'], month=row['month'], post_count=row['post_count'])
+        for row in months
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_admin_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostArchiveMonth',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField()),
+                ('month', models.PositiveSmallIntegerField()),
+                ('post_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('active', True), ('status', 'published')), fields=['-published_date', '-id'], name='post_archive_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='postarchivemonth',
+            constraint=models.UniqueConstraint(fields=('year', 'month'), name='archive_month_unique'),
+        ),
+        migrations.RunPython(backfill_archive_months, migrations.RunPython.noop),
+    ]
@@ -1,18 +1,57 @@
+import hashlib
+
+from django.conf import settings
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 
 from blog import PostStatus
 
 
+def normalize_content(content: str) -> str:
+    return " ".join(content.casefold().split())
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(normalize_content(content).encode()).hexdigest()
+
+
 class Author(models.Model):
     name = models.CharField(max_length=100)
     email = models.EmailField(unique=True)
     user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["name"],
+                opclasses=["varchar_pattern_ops"],
+                name="author_name_prefix_idx",
+            ),
+        ]
+
     def __str__(self) -> str:
         return self.name
 
 
+class Tag(models.Model):
+    name = models.CharField(max_length=50)
+    slug = models.SlugField(max_length=50, unique=True)
+    # Published, active posts only; maintained by blog.signals.
+    post_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-post_count", "slug"], name="tag_cloud_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return self.name
+
+
+ARCHIVE_FIELDS = frozenset({"status", "active", "published_date"})
+
+
 class Post(models.Model):
     title = models.CharField(max_length=200, blank=False)
     content = models.TextField(blank=False)
@@ -23,19 +62,160 @@ class Post(models.Model):
         related_name="posts",
         db_index=True,
     )
+    author_id: int
+    # Archive bucket of the row as stored; see lock_archive_state.
+    stored_archive_state: tuple[int, int] | None = None
     status = models.CharField(
         max_length=10,
         choices=PostStatus.CHOICES,
         default=PostStatus.DRAFT,
     )
     active = models.BooleanField(default=True)
+    trending_score = models.FloatField(default=0.0)
+    views = models.PositiveBigIntegerField(default=0)
+    publish_at = models.DateTimeField(null=True, blank=True)
+    tags = models.ManyToManyField(
+        Tag,
+        through="PostTag",
+        related_name="posts",
+        blank=True,
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["title"],
+                opclasses=["varchar_pattern_ops"],
+                name="post_title_prefix_idx",
+            ),
+            models.Index(
+                fields=["-trending_score", "-id"],
+                condition=models.Q(active=True),
+                name="post_trending_idx",
+            ),
+            models.Index(
+                fields=["-published_date", "-id"],
+                condition=models.Q(status=PostStatus.PUBLISHED, active=True),
+                name="post_archive_idx",
+            ),
+            models.Index(
+                fields=["-views", "-id"],
+                condition=models.Q(active=True),
+                name="post_views_idx",
+            ),
+            models.Index(
+                fields=["publish_at"],
+                condition=models.Q(status=PostStatus.DRAFT, publish_at__isnull=False),
+                name="post_publish_due_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.title
 
+    def save(self, *args, **kwargs) -> None:
+        if self._state.adding and not self.trending_score:
+            self.trending_score = settings.TRENDING_NEW_POST_SCORE
+        # The row lock taken in pre_save is held until post_save has adjusted
+        # the archive and tag counts.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    def lock_archive_state(self) -> tuple[int, int] | None:
+        # Locked, so a concurrent write or the publish worker cannot count the
+        # same change twice.
+        stored = None
+        if not self._state.adding:
+            stored = (
+                Post.objects.select_for_update()
+                .only(*ARCHIVE_FIELDS)
+                .filter(pk=self.pk)
+                .first()
+            )
+        self.stored_archive_state = stored.archive_state if stored else None
+        return self.stored_archive_state
+
+    @property
+    def archive_state(self) -> tuple[int, int] | None:
+        if (
+            self.status != PostStatus.PUBLISHED
+            or not self.active
+            or self.published_date is None
+        ):
+            return None
+        published = timezone.localtime(self.published_date)
+        return published.year, published.month
+
+
+class PostTag(models.Model):
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="post_tags")
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name="post_tags")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["tag", "post"], name="post_tag_unique"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.post_id} #{self.tag_id}"
+
+
+class PostVector(models.Model):
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="vector",
+    )
+    vector = models.BinaryField()
+    updated = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"Vector of post {self.post_id}"
+
+
+class RelatedPost(models.Model):
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name="related_posts",
+    )
+    related = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="+")
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["post", "rank"],
+                name="related_post_rank_unique",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.post_id} -> {self.related_id} ({self.score:.3f})"
+
+
+class PostArchiveMonth(models.Model):
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField()
+    post_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["year", "month"],
+                name="archive_month_unique",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.year}-{self.month:02d} ({self.post_count})"
+
 
 class Comment(models.Model):
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="comments")
+    post_id: int
     content = models.TextField(blank=False)
     user = models.ForeignKey(
         User,
@@ -45,6 +225,15 @@ class Comment(models.Model):
         related_name="comments",
     )
     created = models.DateTimeField(auto_now_add=True)
+    content_hash = models.CharField(max_length=64, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["content_hash", "created"],
+                name="comment_content_hash_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         user_display = self.user.username if self.user else "Anonymous"
@@ -52,3 +241,20 @@ class Comment(models.Model):
             f"Comment by {user_display} "
             f"on {self.post.title}"
         )
+
+    def save(self, *args, **kwargs) -> None:
+        self.content_hash = content_hash(self.content)
+        super().save(*args, **kwargs)
+
+
+class BlockedPhrase(models.Model):
+    phrase = models.CharField(max_length=200, unique=True)
+    created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return self.phrase
+
+    def save(self, *args, **kwargs) -> None:
+        self.phrase = normalize_content(self.phrase)
+        super().save(*args, **kwargs)
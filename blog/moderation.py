@@ -0,0 +1,94 @@
+import re
+import threading
+import time
+
+from datetime import timedelta
+from typing import Any, Optional
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from blog.models import BlockedPhrase, Comment, normalize_content
+
+
+def trie_regex(phrases: list[str]) -> str:
+    # A trie shares common prefixes, so matching cost grows with the length
+    # of the text rather than the number of phrases.
+    trie: dict[str, Any] = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return _trie_node_regex(trie)
+
+
+def _trie_node_regex(node: dict[str, Any]) -> str:
+    alternatives = [
+        re.escape(char) + _trie_node_regex(child)
+        for char, child in sorted(node.items())
+        if char
+    ]
+    if not alternatives:
+        return ""
+    pattern = alternatives[0]
+    if len(alternatives) > 1:
+        pattern = f"(?:{'|'.join(alternatives)})"
+    if "" in node:
+        pattern = f"(?:{pattern})?"
+    return pattern
+
+
+def compile_blocklist(phrases: list[str]) -> Optional[re.Pattern]:
+    phrases = [phrase for phrase in phrases if phrase]
+    if not phrases:
+        return None
+    # Whole words only, so "class" is not caught by a blocked "ass".
+    return re.compile(rf"(?<!\w){trie_regex(phrases)}(?!\w)")
+
+
+class BlocklistMatcher:
+    _pattern: Optional[re.Pattern] = None
+    _fingerprint: Any = None
+    _checked_at: float = float("-inf")
+    _lock = threading.Lock()
+
+    @classmethod
+    def find(cls, content: str) -> Optional[str]:
+        if time.monotonic() - cls._checked_at > settings.MODERATION_BLOCKLIST_REFRESH:
+            cls.refresh()
+        pattern = cls._pattern
+        if pattern is None:
+            return None
+        match = pattern.search(normalize_content(content))
+        return match.group(0) if match else None
+
+    @classmethod
+    def refresh(cls) -> None:
+        with cls._lock:
+            fingerprint = BlockedPhrase.objects.aggregate(
+                count=Count("id"),
+                updated=Max("updated"),
+            )
+            if fingerprint != cls._fingerprint:
+                cls._pattern = compile_blocklist(
+                    list(BlockedPhrase.objects.values_list("phrase", flat=True)),
+                )
+                cls._fingerprint = fingerprint
+            cls._checked_at = time.monotonic()
+
+    @classmethod
+    def invalidate(cls) -> None:
+        with cls._lock:
+            cls._checked_at = float("-inf")
+
+
+def is_recent_duplicate(digest: str, post_id: int, user_id: Optional[int]) -> bool:
+    since = timezone.now() - timedelta(seconds=settings.MODERATION_DUPLICATE_WINDOW)
+    return Comment.objects.filter(
+        content_hash=digest,
+        created__gte=since,
+        post_id=post_id,
+        user_id=user_id,
+    ).exists()
@@ -0,0 +1,291 @@
+import hashlib
+import re
+
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable
+
+import numpy as np
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import QuerySet
+
+from blog import PostStatus
+from blog.models import Post, PostVector, RelatedPost
+
+TOKEN_PATTERN = re.compile(r"\w{2,}")
+TITLE_WEIGHT = 2
+STOP_WORDS = frozenset(
+    "a an and are as at be but by for from has have he her his i if in into is it its "
+    "me my no not of on or our she so than that the their them then there these they "
+    "this to was we were what when which who will with you your".split(),
+)
+
+
+@dataclass
+class BuildReport:
+    vectorized: int = 0
+    updated: int = 0
+
+
+def candidate_posts() -> QuerySet[Post]:
+    return Post.objects.filter(status=PostStatus.PUBLISHED, active=True)
+
+
+@lru_cache(maxsize=65536)
+def token_feature(token: str, dimensions: int) -> tuple[int, float]:
+    # Signed feature hashing, so colliding tokens tend to cancel out.
+    digest = hashlib.blake2b(token.encode(), digest_size=8).digest()
+    value = int.from_bytes(digest, "little")
+    return value % dimensions, 1.0 if value >> 63 else -1.0
+
+
+def vectorize(title: str, content: str, dimensions: int) -> np.ndarray:
+    counts: Counter[str] = Counter()
+    for text, weight in ((title, TITLE_WEIGHT), (content, 1)):
+        for token in TOKEN_PATTERN.findall(text.casefold()):
+            if token not in STOP_WORDS:
+                counts[token] += weight
+
+    vector = np.zeros(dimensions, dtype=np.float32)
+    if counts:
+        features = [token_feature(token, dimensions) for token in counts]
+        indexes = np.fromiter((index for index, _ in features), dtype=np.intp)
+        signs = np.fromiter((sign for _, sign in features), dtype=np.float32)
+        weights = np.log1p(np.fromiter(counts.values(), dtype=np.float32))
+        np.add.at(vector, indexes, signs * weights)
+    norm = np.linalg.norm(vector)
+    if norm:
+        vector /= norm
+    return vector
+
+
+def store_vectors(
+    posts: Iterable[Post],
+    dimensions: int,
+    batch_size: int = 1000,
+) -> list[int]:
+    post_ids: list[int] = []
+    batch: list[PostVector] = []
+    for post in posts:
+        vector = vectorize(post.title, post.content, dimensions)
+        batch.append(PostVector(post_id=post.pk, vector=vector.tobytes()))
+        post_ids.append(post.pk)
+        if len(batch) == batch_size:
+            _save_vectors(batch)
+            batch = []
+    _save_vectors(batch)
+    return post_ids
+
+
+def _save_vectors(batch: list[PostVector]) -> None:
+    PostVector.objects.bulk_create(
+        batch,
+        update_conflicts=True,
+        unique_fields=["post"],
+        update_fields=["vector", "updated"],
+    )
+
+
+def load_matrix(dimensions: int) -> tuple[np.ndarray, np.ndarray]:
+    rows = (
+        PostVector.objects.filter(
+            post__status=PostStatus.PUBLISHED,
+            post__active=True,
+        )
+        .order_by("post_id")
+        .values_list("post_id", "vector")
+    )
+
+    ids: list[int] = []
+    vectors: list[bytes] = []
+    for post_id, vector in rows.iterator(chunk_size=2000):
+        ids.append(post_id)
+        vectors.append(bytes(vector))
+    matrix: np.ndarray = np.frombuffer(b"".join(vectors), dtype=np.float32)
+    if matrix.size != len(ids) * dimensions:
+        raise ValueError(
+            "Stored vectors do not match RELATED_POSTS_FEATURES; run a full rebuild.",
+        )
+    return np.array(ids, dtype=np.int64), matrix.reshape(len(ids), dimensions)
+
+
+def top_neighbours(scores: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    k = min(k, scores.shape[1])
+    columns = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    values: np.ndarray = np.take_along_axis(scores, columns, axis=1)
+    order = np.argsort(-values, axis=1, kind="stable")
+    return (
+        np.take_along_axis(columns, order, axis=1),
+        np.take_along_axis(values, order, axis=1),
+    )
+
+
+def neighbour_rows(
+    post_id: int,
+    neighbours: Iterable[tuple[int, float]],
+) -> list[RelatedPost]:
+    rows: list[RelatedPost] = []
+    for related_id, score in neighbours:
+        if score <= settings.RELATED_POSTS_MIN_SCORE:
+            break
+        rows.append(
+            RelatedPost(
+                post_id=post_id,
+                related_id=related_id,
+                score=score,
+                rank=len(rows),
+            ),
+        )
+    return rows
+
+
+def compute_neighbours(
+    ids: np.ndarray,
+    matrix: np.ndarray,
+    rows: np.ndarray,
+    k: int,
+    block_size: int,
+) -> Iterable[tuple[int, list[tuple[int, float]]]]:
+    # Memory stays at block_size x n scores however large the corpus gets.
+    for start in range(0, len(rows), block_size):
+        block = rows[start : start + block_size]
+        scores = matrix[block] @ matrix.T
+        scores[np.arange(len(block)), block] = -np.inf
+        columns, values = top_neighbours(scores, k)
+        for row, row_columns, row_values in zip(block, columns, values, strict=True):
+            yield (
+                int(ids[row]),
+                [
+                    (int(ids[column]), float(value))
+                    for column, value in zip(row_columns, row_values, strict=True)
+                ],
+            )
+
+
+def build_all(k: int, block_size: int) -> BuildReport:
+    dimensions: int = settings.RELATED_POSTS_FEATURES
+    report = BuildReport()
+    with transaction.atomic():
+        posts = candidate_posts().only("id", "title", "content")
+        report.vectorized = len(store_vectors(posts.iterator(), dimensions))
+        ids, matrix = load_matrix(dimensions)
+        RelatedPost.objects.all().delete()
+        if len(ids) < 2:  # noqa: PLR2004
+            return report
+
+        batch: list[RelatedPost] = []
+        for post_id, neighbours in compute_neighbours(
+            ids,
+            matrix,
+            np.arange(len(ids)),
+            k,
+            block_size,
+        ):
+            batch += neighbour_rows(post_id, neighbours)
+            report.updated += 1
+            if len(batch) >= 1000:  # noqa: PLR2004
+                RelatedPost.objects.bulk_create(batch)
+                batch = []
+        RelatedPost.objects.bulk_create(batch)
+    return report
+
+
+def build_incremental(k: int, block_size: int) -> BuildReport:
+    # Existing posts only change where a new post beats their worst neighbour.
+    dimensions: int = settings.RELATED_POSTS_FEATURES
+    report = BuildReport()
+    with transaction.atomic():
+        posts = candidate_posts().filter(vector__isnull=True)
+        posts = posts.only("id", "title", "content")
+        new_ids = store_vectors(posts.iterator(), dimensions)
+        report.vectorized = len(new_ids)
+        if not new_ids:
+            return report
+
+        ids, matrix = load_matrix(dimensions)
+        is_new: np.ndarray = np.isin(ids, new_ids)
+        new_rows = np.flatnonzero(is_new)
+        if len(ids) < 2:  # noqa: PLR2004
+            return report
+
+        lists = dict(compute_neighbours(ids, matrix, new_rows, k, block_size))
+        existing_rows = np.flatnonzero(~is_new)
+        lists.update(
+            _merge_new_neighbours(ids, matrix, new_rows, existing_rows, k, block_size),
+        )
+
+        RelatedPost.objects.filter(post_id__in=list(lists)).delete()
+        batch: list[RelatedPost] = []
+        for post_id, neighbours in lists.items():
+            batch += neighbour_rows(post_id, neighbours)
+        RelatedPost.objects.bulk_create(batch, batch_size=1000)
+        report.updated = len(lists)
+    return report
+
+
+def _merge_new_neighbours(
+    ids: np.ndarray,
+    matrix: np.ndarray,
+    new_rows: np.ndarray,
+    existing_rows: np.ndarray,
+    k: int,
+    block_size: int,
+) -> dict[int, list[tuple[int, float]]]:
+    updated: dict[int, list[tuple[int, float]]] = {}
+    queries = matrix[new_rows]
+    for start in range(0, len(existing_rows), block_size):
+        block = existing_rows[start : start + block_size]
+        scores = matrix[block] @ queries.T
+        columns, values = top_neighbours(scores, k)
+
+        block_ids = [int(ids[row]) for row in block]
+        current: dict[int, list[tuple[int, float]]] = {
+            post_id: [] for post_id in block_ids
+        }
+        for post_id, related_id, score in (
+            RelatedPost.objects.filter(post_id__in=block_ids)
+            .order_by("post_id", "rank")
+            .values_list("post_id", "related_id", "score")
+        ):
+            current[post_id].append((related_id, score))
+
+        for post_id, row_columns, row_values in zip(
+            block_ids,
+            columns,
+            values,
+            strict=True,
+        ):
+            existing = current[post_id]
+            if len(existing) >= k:
+                worst = existing[-1][1]
+            else:
+                worst = settings.RELATED_POSTS_MIN_SCORE
+            candidates = [
+                (int(ids[new_rows[column]]), float(value))
+                for column, value in zip(row_columns, row_values, strict=True)
+                if value > worst
+            ]
+            if candidates:
+                merged = sorted(
+                    existing + candidates,
+                    key=lambda item: item[1],
+                    reverse=True,
+                )
+                updated[post_id] = merged[:k]
+    return updated
+
+
+def related_posts(post_id: int) -> list[Post]:
+    rows = (
+        RelatedPost.objects.filter(
+            post_id=post_id,
+            related__status=PostStatus.PUBLISHED,
+            related__active=True,
+        )
+        .select_related("related__author")
+        .order_by("rank")
+    )
+    return [row.related for row in rows]
@@ -0,0 +1,80 @@
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, QuerySet, Value
+from django.db.models.functions import Greatest
+from django.dispatch import Signal
+from django.utils import timezone
+
+from blog import PostStatus, archive, tagging
+from blog.models import Post, PostTag
+
+# Sent with `post_ids`; the bulk update sends no post_save.
+posts_published = Signal()
+
+
+def due_posts(now: datetime) -> QuerySet[Post]:
+    return Post.objects.filter(
+        status=PostStatus.DRAFT,
+        publish_at__isnull=False,
+        publish_at__lte=now,
+    )
+
+
+def publish_due_batch(batch_size: int, now: Optional[datetime] = None) -> list[int]:
+    now = now or timezone.now()
+    with transaction.atomic():
+        due = list(
+            due_posts(now)
+            .select_for_update(skip_locked=True)
+            .order_by("publish_at", "id")
+            .values_list("id", "publish_at", "active")[:batch_size],
+        )
+        if not due:
+            return []
+
+        post_ids = [post_id for post_id, _, _ in due]
+        Post.objects.filter(pk__in=post_ids).update(
+            status=PostStatus.PUBLISHED,
+            published_date=F("publish_at"),
+            publish_at=None,
+            trending_score=Greatest(
+                F("trending_score"),
+                Value(settings.TRENDING_NEW_POST_SCORE),
+            ),
+        )
+
+        visible = [
+            (post_id, timezone.localtime(publish_at))
+            for post_id, publish_at, active in due
+            if active
+        ]
+        archive.adjust_months(
+            Counter((published.year, published.month) for _, published in visible),
+        )
+        adjust_published_tag_counts([post_id for post_id, _ in visible])
+        posts_published.send(sender=Post, post_ids=post_ids)
+    return post_ids
+
+
+def adjust_published_tag_counts(post_ids: list[int]) -> None:
+    tag_counts = Counter(
+        PostTag.objects.filter(post_id__in=post_ids).values_list("tag_id", flat=True),
+    )
+    by_delta: dict[int, list[int]] = defaultdict(list)
+    for tag_id, delta in tag_counts.items():
+        by_delta[delta].append(tag_id)
+    for delta, tag_ids in by_delta.items():
+        tagging.adjust_tag_counts(tag_ids, delta)
+
+
+def publish_due(batch_size: int, now: Optional[datetime] = None) -> int:
+    published = 0
+    while True:
+        post_ids = publish_due_batch(batch_size, now)
+        published += len(post_ids)
+        if len(post_ids) < batch_size:
+            return published
@@ -0,0 +1,107 @@
+from typing import Any
+
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import Signal, receiver
+
+from blog import archive, tagging, tasks
+from blog.models import BlockedPhrase, Comment, Post, Tag
+from blog.moderation import BlocklistMatcher
+
+# Sent with `post_id` and `comments`, also for bulk-created comments.
+comments_created = Signal()
+
+
+@receiver(pre_save, sender=Post)
+def load_archive_state(instance: Post, **_kwargs: Any) -> None:
+    instance.lock_archive_state()
+
+
+@receiver(post_save, sender=Post)
+def update_archive_on_save(
+    instance: Post,
+    *,
+    created: bool,
+    **_kwargs: Any,
+) -> None:
+    before = None if created else instance.stored_archive_state
+    after = instance.archive_state
+    archive.record_transition(before, after)
+    if not created and (before is None) != (after is None):
+        tagging.adjust_tag_counts(
+            tagging.post_tag_ids(instance.pk),
+            1 if after is not None else -1,
+        )
+    instance.stored_archive_state = after
+
+
+@receiver(pre_delete, sender=Post)
+def update_tag_counts_on_delete(instance: Post, **_kwargs: Any) -> None:
+    # The cascade removes the PostTag rows without m2m_changed signals.
+    if instance.lock_archive_state() is not None:
+        tagging.adjust_tag_counts(tagging.post_tag_ids(instance.pk), -1)
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def update_tag_counts(
+    instance: Post | Tag,
+    *,
+    action: str,
+    pk_set: set[int] | None,
+    **_kwargs: Any,
+) -> None:
+    if action == "pre_clear":
+        # post_clear does not say what was removed, so count it up front.
+        delta = -1
+        if isinstance(instance, Tag):
+            changed = tagging.tag_post_ids(instance.pk)
+        else:
+            changed = tagging.post_tag_ids(instance.pk)
+    elif action in ("post_add", "post_remove"):
+        delta = 1 if action == "post_add" else -1
+        changed = list(pk_set or [])
+    else:
+        return
+
+    if isinstance(instance, Tag):
+        tagging.adjust_tag_counts(
+            [instance.pk],
+            delta * tagging.visible_post_count(changed),
+        )
+    elif instance.archive_state is not None:
+        tagging.adjust_tag_counts(changed, delta)
+
+
+@receiver(post_delete, sender=Post)
+def update_archive_on_delete(instance: Post, **_kwargs: Any) -> None:
+    # The stored state was locked and read by update_tag_counts_on_delete.
+    archive.record_transition(instance.stored_archive_state, None)
+
+
+@receiver([post_save, post_delete], sender=BlockedPhrase)
+def invalidate_blocklist(**_kwargs: Any) -> None:
+    BlocklistMatcher.invalidate()
+
+
+@receiver(post_save, sender=Comment)
+def announce_new_comment(instance: Comment, *, created: bool, **_kwargs: Any) -> None:
+    if created:
+        comments_created.send(
+            sender=Comment,
+            post_id=instance.post_id,
+            comments=[instance],
+        )
+
+
+@receiver(comments_created)
+def record_trending_comments(
+    post_id: int,
+    comments: list[Comment],
+    **_kwargs: Any,
+) -> None:
+    tasks.record_comments.delay(post_id, len(comments))
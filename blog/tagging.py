@@ -0,0 +1,70 @@
+from typing import Iterable
+
+from django.db.models import Count, F, QuerySet
+from django.db.models.functions import Greatest
+from django.utils.text import slugify
+
+from blog import PostStatus
+from blog.models import Post, PostTag, Tag
+
+MATCH_ANY = "any"
+MATCH_ALL = "all"
+
+
+def adjust_tag_counts(tag_ids: Iterable[int], delta: int) -> None:
+    tag_ids = list(tag_ids)
+    if tag_ids and delta:
+        Tag.objects.filter(pk__in=tag_ids).update(
+            post_count=Greatest(F("post_count") + delta, 0),
+        )
+
+
+def post_tag_ids(post_id: int) -> list[int]:
+    tag_ids = PostTag.objects.filter(post_id=post_id).values_list("tag_id", flat=True)
+    return list(tag_ids)
+
+
+def tag_post_ids(tag_id: int) -> list[int]:
+    post_ids = PostTag.objects.filter(tag_id=tag_id).values_list("post_id", flat=True)
+    return list(post_ids)
+
+
+def visible_post_count(post_ids: Iterable[int]) -> int:
+    return Post.objects.filter(
+        pk__in=list(post_ids),
+        status=PostStatus.PUBLISHED,
+        active=True,
+    ).count()
+
+
+def get_or_create_tags(names: Iterable[str]) -> list[Tag]:
+    by_slug: dict[str, str] = {}
+    for name in names:
+        slug = slugify(name)
+        if slug:
+            by_slug.setdefault(slug, name.strip())
+    if not by_slug:
+        return []
+    Tag.objects.bulk_create(
+        [Tag(name=name, slug=slug) for slug, name in by_slug.items()],
+        ignore_conflicts=True,
+    )
+    return list(Tag.objects.filter(slug__in=by_slug))
+
+
+def filter_by_tags(queryset: QuerySet[Post], slugs: list[str], match: str) -> QuerySet:
+    # Resolving the slugs first keeps the post lookup on the (tag, post) index.
+    tag_ids = list(Tag.objects.filter(slug__in=slugs).values_list("id", flat=True))
+    if not tag_ids or (match == MATCH_ALL and len(tag_ids) < len(set(slugs))):
+        return queryset.none()
+
+    post_tags = PostTag.objects.filter(tag_id__in=tag_ids).values("post_id")
+    if match == MATCH_ALL:
+        post_tags = post_tags.annotate(matched=Count("tag_id")).filter(
+            matched=len(tag_ids),
+        )
+    return queryset.filter(pk__in=post_tags.values("post_id"))
+
+
+def tag_cloud(limit: int) -> QuerySet[Tag]:
+    return Tag.objects.filter(post_count__gt=0).order_by("-post_count", "slug")[:limit]
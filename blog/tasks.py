@@ -0,0 +1,7 @@
+from blog import trending
+from tasks.runner import task
+
+
+@task
+def record_comments(post_id: int, count: int = 1) -> None:
+    trending.record_comments(post_id, count)
@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.db.models import F, QuerySet
+
+from blog.models import Post
+
+# Scores below this are rounded down to zero, so each decay run only
+# touches posts that still have recent activity.
+SCORE_FLOOR = 0.01
+
+
+def record_comments(post_id: int, count: int = 1) -> None:
+    Post.objects.filter(pk=post_id).update(
+        trending_score=F("trending_score") + settings.TRENDING_COMMENT_SCORE * count,
+    )
+
+
+def decay_scores(factor: float, floor: float = SCORE_FLOOR) -> int:
+    threshold = floor / factor
+    Post.objects.filter(trending_score__gt=0, trending_score__lte=threshold).update(
+        trending_score=0,
+    )
+    return Post.objects.filter(trending_score__gt=threshold).update(
+        trending_score=F("trending_score") * factor,
+    )
+
+
+def trending_posts(limit: int) -> QuerySet[Post]:
+    return (
+        Post.objects.filter(active=True, trending_score__gt=0)
+        .select_related("author")
+        .order_by("-trending_score", "-id")[:limit]
+    )
@@ -0,0 +1,109 @@
+import atexit
+import logging
+import os
+import threading
+
+from collections import Counter
+from typing import Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Case, F, PositiveBigIntegerField, Value, When
+
+from blog.models import Post
+
+logger = logging.getLogger(__name__)
+
+FLUSH_BATCH_SIZE = 1000
+
+
+def add_views(deltas: dict[int, int]) -> None:
+    # Updating in id order keeps concurrent flushes from deadlocking.
+    post_ids = sorted(deltas)
+    for start in range(0, len(post_ids), FLUSH_BATCH_SIZE):
+        batch = post_ids[start : start + FLUSH_BATCH_SIZE]
+        delta = Case(
+            *[When(pk=post_id, then=Value(deltas[post_id])) for post_id in batch],
+            default=Value(0),
+            output_field=PositiveBigIntegerField(),
+        )
+        Post.objects.filter(pk__in=batch).update(views=F("views") + delta)
+
+
+class ViewCounter:
+    def __init__(self) -> None:
+        self._pending: Counter[int] = Counter()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    @property
+    def pending(self) -> dict[int, int]:
+        with self._lock:
+            return dict(self._pending)
+
+    def record(self, post_id: int) -> None:
+        with self._lock:
+            self._pending[post_id] += 1
+            full = len(self._pending) >= settings.VIEW_COUNT_BUFFER_MAX
+        if settings.VIEW_COUNT_FLUSH_INTERVAL > 0:
+            self.start()
+            if full:
+                self._wake.set()
+
+    def flush(self) -> int:
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+        if not pending:
+            return 0
+        try:
+            add_views(pending)
+        except Exception:
+            logger.exception("Could not flush view counts of %s posts", len(pending))
+            with self._lock:
+                self._pending.update(pending)
+            return 0
+        return len(pending)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending.clear()
+
+    def start(self) -> None:
+        # Started again after a fork, so preloaded gunicorn workers get their own.
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._flusher = threading.Thread(
+                target=self.run,
+                name="view-counter",
+                daemon=True,
+            )
+            self._flusher.start()
+
+    def run(self) -> None:
+        while True:
+            self._wake.wait(settings.VIEW_COUNT_FLUSH_INTERVAL)
+            self._wake.clear()
+            try:
+                self.flush()
+            finally:
+                close_old_connections()
+
+
+counter = ViewCounter()
+
+
+def record_view(post_id: int) -> None:
+    counter.record(post_id)
+
+
+def flush_views() -> int:
+    return counter.flush()
+
+
+atexit.register(flush_views)
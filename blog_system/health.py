@@ -0,0 +1,72 @@
+from typing import Callable
+
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.migrations.executor import MigrationExecutor
+from django.http import HttpRequest, JsonResponse
+from django.urls import get_resolver
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_GET
+
+
+def has_pending_migrations(connection: BaseDatabaseWrapper) -> bool:
+    executor = MigrationExecutor(connection)
+    targets = executor.loader.graph.leaf_nodes()
+    return bool(executor.migration_plan(targets))
+
+
+def check_database() -> bool:
+    try:
+        with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except DatabaseError:
+        return False
+    return True
+
+
+def check_migrations() -> bool:
+    try:
+        return not has_pending_migrations(connections[DEFAULT_DB_ALIAS])
+    except DatabaseError:
+        return False
+
+
+def check_urls() -> bool:
+    # Imports every view up front, so the first request does not pay for it.
+    get_resolver().url_patterns  # noqa: B018
+    return True
+
+
+READINESS_CHECKS: dict[str, Callable[[], bool]] = {
+    "database": check_database,
+    "migrations": check_migrations,
+    "urls": check_urls,
+}
+
+
+class Readiness:
+    ready: bool = False
+
+    @classmethod
+    def run_checks(cls) -> dict[str, bool]:
+        results = {name: check() for name, check in READINESS_CHECKS.items()}
+        cls.ready = all(results.values())
+        return results
+
+
+@never_cache
+@require_GET
+def liveness(_request: HttpRequest) -> JsonResponse:
+    return JsonResponse({"status": "alive"})
+
+
+@never_cache
+@require_GET
+def readiness(_request: HttpRequest) -> JsonResponse:
+    if Readiness.ready:
+        return JsonResponse({"status": "ready"})
+
+    checks = Readiness.run_checks()
+    if all(checks.values()):
+        return JsonResponse({"status": "ready", "checks": checks})
+    return JsonResponse({"status": "warming", "checks": checks}, status=503)
@@ -42,6 +42,7 @@ INSTALLED_APPS = [
     # internal apps
     "blog",
     "api",
+    "tasks",
 ]
 
 MIDDLEWARE = [
@@ -52,6 +53,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "api.profiling.ProfilingMiddleware",
 ]
 
 ROOT_URLCONF = "blog_system.urls"
@@ -137,6 +139,30 @@ USE_TZ = True
 STATIC_URL = os.environ.get("STATIC_URL", "/static/")
 STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
 
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": os.environ.get(
+            "STATICFILES_STORAGE",
+            "django.contrib.staticfiles.storage.ManifestStaticFilesStorage",
+        ),
+    },
+}
+
+# Cache: production points CACHE_BACKEND/CACHE_LOCATION at Redis so every
+# process sees the same entries
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND",
+            "django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": os.environ.get("CACHE_LOCATION", ""),
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -144,4 +170,122 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "api.authentication.SignedTokenAuthentication",
+        "rest_framework.authentication.SessionAuthentication",
+        "rest_framework.authentication.BasicAuthentication",
+    ],
 }
+
+# Signed API tokens
+API_TOKEN_TTL = int(os.environ.get("API_TOKEN_TTL", 60 * 60 * 12))
+API_TOKEN_CACHE_TTL = int(os.environ.get("API_TOKEN_CACHE_TTL", 60))
+API_TOKEN_DENYLIST_REFRESH = int(os.environ.get("API_TOKEN_DENYLIST_REFRESH", 30))
+API_TOKEN_USER_STATE_TTL = int(os.environ.get("API_TOKEN_USER_STATE_TTL", 60))
+
+# OpenAPI schema rendered once by `manage.py build_schema_cache` and served from disk
+SCHEMA_CACHE_DIR = os.environ.get(
+    "SCHEMA_CACHE_DIR",
+    os.path.join(BASE_DIR, "schema_cache"),
+)
+SCHEMA_CACHE_MAX_AGE = int(os.environ.get("SCHEMA_CACHE_MAX_AGE", 300))
+
+
+# Trending posts
+TRENDING_NEW_POST_SCORE = float(os.environ.get("TRENDING_NEW_POST_SCORE", 1.0))
+TRENDING_COMMENT_SCORE = float(os.environ.get("TRENDING_COMMENT_SCORE", 1.0))
+TRENDING_DECAY_FACTOR = float(os.environ.get("TRENDING_DECAY_FACTOR", 0.5))
+TRENDING_MAX_LIMIT = int(os.environ.get("TRENDING_MAX_LIMIT", 50))
+
+# Related posts, precomputed by `manage.py build_related_posts`
+RELATED_POSTS_K = int(os.environ.get("RELATED_POSTS_K", 10))
+RELATED_POSTS_FEATURES = int(os.environ.get("RELATED_POSTS_FEATURES", 1024))
+RELATED_POSTS_BLOCK_SIZE = int(os.environ.get("RELATED_POSTS_BLOCK_SIZE", 256))
+RELATED_POSTS_MIN_SCORE = float(os.environ.get("RELATED_POSTS_MIN_SCORE", 0.05))
+
+# Post view counts are buffered in each worker and written in one batched
+# UPDATE every VIEW_COUNT_FLUSH_INTERVAL seconds (0 disables the background
+# flush), earlier once VIEW_COUNT_BUFFER_MAX posts are pending, and on exit
+VIEW_COUNT_FLUSH_INTERVAL = float(os.environ.get("VIEW_COUNT_FLUSH_INTERVAL", 10))
+VIEW_COUNT_BUFFER_MAX = int(os.environ.get("VIEW_COUNT_BUFFER_MAX", 10_000))
+
+# Scheduled publishing (`manage.py publish_due`)
+PUBLISH_DUE_BATCH_SIZE = int(os.environ.get("PUBLISH_DUE_BATCH_SIZE", 100))
+
+# Tags
+TAGS_PER_POST_MAX = int(os.environ.get("TAGS_PER_POST_MAX", 20))
+TAGS_FILTER_MAX = int(os.environ.get("TAGS_FILTER_MAX", 10))
+TAGS_CLOUD_MAX = int(os.environ.get("TAGS_CLOUD_MAX", 200))
+
+# Batch endpoints
+POST_BATCH_MAX_SIZE = int(os.environ.get("POST_BATCH_MAX_SIZE", 100))
+COMMENT_BULK_MAX_SIZE = int(os.environ.get("COMMENT_BULK_MAX_SIZE", 100))
+COMMENT_BULK_THROTTLE_RATE = os.environ.get("COMMENT_BULK_THROTTLE_RATE", "30/hour")
+
+# Comment moderation
+MODERATION_BLOCKLIST_REFRESH = int(os.environ.get("MODERATION_BLOCKLIST_REFRESH", 30))
+MODERATION_DUPLICATE_WINDOW = int(os.environ.get("MODERATION_DUPLICATE_WINDOW", 600))
+
+# Live comment streams (`/posts/<id>/comments/stream/`), served by the ASGI app.
+# The local backend only reaches streams in the same process; the Postgres one
+# fans out across processes with LISTEN/NOTIFY
+STREAM_BACKEND = os.environ.get("STREAM_BACKEND", "api.streams.LocalStreamBackend")
+STREAM_CHANNEL = os.environ.get("STREAM_CHANNEL", "comment_stream")
+STREAM_BUFFER_SIZE = int(os.environ.get("STREAM_BUFFER_SIZE", 100))
+STREAM_HEARTBEAT = float(os.environ.get("STREAM_HEARTBEAT", 15))
+STREAM_RETRY_MS = int(os.environ.get("STREAM_RETRY_MS", 3000))
+STREAM_REPLAY_MAX = int(os.environ.get("STREAM_REPLAY_MAX", 100))
+STREAM_MAX_SUBSCRIBERS = int(os.environ.get("STREAM_MAX_SUBSCRIBERS", 5000))
+
+# Paginated counts are exact up to this many rows and planner estimates above it
+EXACT_COUNT_THRESHOLD = int(os.environ.get("EXACT_COUNT_THRESHOLD", 10_000))
+COUNT_CACHE_TIMEOUT = int(os.environ.get("COUNT_CACHE_TIMEOUT", 30))
+
+# Background tasks run after commit in a bounded per-worker thread pool, or
+# through the durable queue processed by `manage.py run_tasks`
+TASKS_WORKERS = int(os.environ.get("TASKS_WORKERS", 4))
+TASKS_QUEUE_SIZE = int(os.environ.get("TASKS_QUEUE_SIZE", 1000))
+TASKS_DURABLE = (os.environ.get("TASKS_DURABLE") == "True")
+TASKS_ALWAYS_EAGER = (os.environ.get("TASKS_ALWAYS_EAGER") == "True")
+TASKS_MAX_ATTEMPTS = int(os.environ.get("TASKS_MAX_ATTEMPTS", 5))
+TASKS_RETRY_DELAY = float(os.environ.get("TASKS_RETRY_DELAY", 1.0))
+TASKS_BATCH_SIZE = int(os.environ.get("TASKS_BATCH_SIZE", 100))
+TASKS_VISIBILITY_TIMEOUT = int(os.environ.get("TASKS_VISIBILITY_TIMEOUT", 300))
+
+# Response cache for the post endpoints. Invalidation has to reach every
+# process, so it stays off while the cache is the per-process local memory one
+RESPONSE_CACHE_ENABLED = os.environ.get(
+    "RESPONSE_CACHE_ENABLED",
+    str(not CACHES["default"]["BACKEND"].endswith(".LocMemCache")),
+) == "True"
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get("RESPONSE_CACHE_TIMEOUT", 300))
+RESPONSE_CACHE_FILL_TIMEOUT = int(os.environ.get("RESPONSE_CACHE_FILL_TIMEOUT", 5))
+
+# Anonymous post responses are tagged with Surrogate-Key headers and may be
+# micro-cached by the proxy; writes purge the affected keys through the backend
+PROXY_CACHE_MAX_AGE = int(os.environ.get("PROXY_CACHE_MAX_AGE", 5))
+CACHE_PURGE_BACKEND = os.environ.get(
+    "CACHE_PURGE_BACKEND",
+    "api.surrogate.NullPurgeBackend",
+)
+CACHE_PURGE_URL = os.environ.get("CACHE_PURGE_URL", "")
+CACHE_PURGE_TIMEOUT = float(os.environ.get("CACHE_PURGE_TIMEOUT", 2.0))
+
+# Request profiling: staff opt in per request (`X-Profile: 1` or `?profile=1`),
+# and a sampled share of requests is kept when slower than the threshold
+PROFILE_DIR = os.environ.get("PROFILE_DIR", os.path.join(BASE_DIR, "profiles"))
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", 0.0))
+PROFILE_SLOW_THRESHOLD_MS = float(os.environ.get("PROFILE_SLOW_THRESHOLD_MS", 500))
+PROFILE_MAX_QUERIES = int(os.environ.get("PROFILE_MAX_QUERIES", 200))
+PROFILE_KEEP = int(os.environ.get("PROFILE_KEEP", 200))
+
+# Cache warm-up (`manage.py warm_cache`, or on worker start-up)
+WARM_CACHE_ON_STARTUP = (os.environ.get("WARM_CACHE_ON_STARTUP") == "True")
+# Host the proxy forwards (with its port); cached list pages are keyed on it
+PUBLIC_HOST = os.environ.get("PUBLIC_HOST", "localhost:8001")
+WARM_CACHE_HOST = os.environ.get("WARM_CACHE_HOST", PUBLIC_HOST)
+WARM_CACHE_POSTS = int(os.environ.get("WARM_CACHE_POSTS", 50))
+WARM_CACHE_PAGES = int(os.environ.get("WARM_CACHE_PAGES", 3))
+WARM_CACHE_PAGE_SIZE = int(os.environ.get("WARM_CACHE_PAGE_SIZE", 20))
+WARM_CACHE_WORKERS = int(os.environ.get("WARM_CACHE_WORKERS", 4))
+WARM_CACHE_BUDGET = float(os.environ.get("WARM_CACHE_BUDGET", 10))
@@ -1,17 +1,20 @@
 from django.contrib import admin
 from django.urls import include, path
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularRedocView,
-    SpectacularSwaggerView,
-)
+from drf_spectacular.views import SpectacularRedocView, SpectacularSwaggerView
+
+from api.schema import CachedSpectacularAPIView
+from blog_system.health import liveness, readiness
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/v1/", include("api.urls")),
 
+    # Probes
+    path("health/live/", liveness, name="health-live"),
+    path("health/ready/", readiness, name="health-ready"),
+
     # Documentation - Swagger
-    path("api/v1/schema/", SpectacularAPIView.as_view(), name="schema"),
+    path("api/v1/schema/", CachedSpectacularAPIView.as_view(), name="schema"),
         path(
         "api/v1/docs/",
         SpectacularSwaggerView.as_view(url_name="schema"),
@@ -1,5 +1,4 @@
 #!/usr/bin/env bash
 
-python manage.py collectstatic --noinput
-python manage.py migrate --noinput
-python -m gunicorn --bind 0.0.0.0:8000 --workers 3 blog_system.wsgi:application
+# Migrations run in the one-shot `migrate` service.
+exec python -m gunicorn blog_system.wsgi:application
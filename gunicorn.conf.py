@@ -0,0 +1,26 @@
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("GUNICORN_WORKERS", "3"))
+
+# Load the app once in the master so forked workers start warm.
+preload_app = True
+
+
+def post_worker_init(_worker: object) -> None:
+    from django.conf import settings
+
+    if not settings.WARM_CACHE_ON_STARTUP:
+        return
+
+    from api.warmup import finished, warm_cache_in_background
+    from blog_system.health import READINESS_CHECKS
+
+    READINESS_CHECKS["cache"] = finished.is_set
+    warm_cache_in_background()
+
+
+def worker_exit(_server: object, _worker: object) -> None:
+    from blog.viewcounts import flush_views
+
+    flush_views()
@@ -0,0 +1,10 @@
+class TaskStatus:
+    PENDING = "pending"
+    RUNNING = "running"
+    FAILED = "failed"
+
+    CHOICES = [
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (FAILED, "Failed"),
+    ]
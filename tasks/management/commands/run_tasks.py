@@ -0,0 +1,39 @@
+import time
+
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+
+from tasks.runner import metrics, run_queued_tasks
+
+
+class Command(BaseCommand):
+    help = "Process tasks from the durable queue, retrying failures with backoff."  # noqa: A003
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch-size", type=int, default=settings.TASKS_BATCH_SIZE)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to sleep when the queue is empty.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the queue once and exit instead of polling forever.",
+        )
+
+    def handle(self, *_args: Any, **options: Any) -> None:
+        batch_size: int = options["batch_size"]
+        while True:
+            processed = run_queued_tasks(batch_size)
+            if processed:
+                self.stdout.write(
+                    f"Processed {processed} tasks. Metrics: {metrics.snapshot()}",
+                )
+                continue
+            if options["once"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,38 @@
+from django.db import models
+from django.utils import timezone
+
+from tasks import TaskStatus
+
+
+class QueuedTask(models.Model):
+    name = models.CharField(max_length=200)
+    arguments = models.JSONField(default=dict)
+    dedupe_key = models.CharField(max_length=64)
+    status = models.CharField(
+        max_length=10,
+        choices=TaskStatus.CHOICES,
+        default=TaskStatus.PENDING,
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["run_after"],
+                condition=models.Q(status__in=[TaskStatus.PENDING, TaskStatus.RUNNING]),
+                name="queuedtask_due_idx",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["dedupe_key"],
+                condition=models.Q(status=TaskStatus.PENDING),
+                name="queuedtask_pending_dedupe",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.status})"
@@ -0,0 +1,278 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Callable, Optional
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.utils import timezone
+
+from tasks import TaskStatus
+from tasks.models import QueuedTask
+
+logger = logging.getLogger(__name__)
+
+registry: dict[str, "Task"] = {}
+
+
+class TaskMetrics:
+    def __init__(self) -> None:
+        self._counts: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[name] += amount
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+metrics = TaskMetrics()
+
+
+class TaskPool:
+    # A full queue runs the task inline, which applies back-pressure.
+    def __init__(self) -> None:
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[threading.BoundedSemaphore] = None
+        self._queued: set[str] = set()
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        self._executor = None
+        self._slots = None
+        self._queued = set()
+        self._lock = threading.Lock()
+
+    def _ensure_started(self) -> tuple[ThreadPoolExecutor, threading.BoundedSemaphore]:
+        with self._lock:
+            if self._executor is None or self._slots is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=settings.TASKS_WORKERS,
+                    thread_name_prefix="tasks",
+                )
+                self._slots = threading.BoundedSemaphore(settings.TASKS_QUEUE_SIZE)
+            return self._executor, self._slots
+
+    def submit(self, task: "Task", args: tuple, kwargs: dict, attempt: int = 1) -> None:
+        if settings.TASKS_ALWAYS_EAGER:
+            task.run(args, kwargs, attempt)
+            return
+
+        key = task.dedupe_key(args, kwargs) if task.dedupe else None
+        with self._lock:
+            if key is not None and key in self._queued:
+                metrics.incr("deduplicated")
+                return
+            if key is not None:
+                self._queued.add(key)
+
+        executor, slots = self._ensure_started()
+        if not slots.acquire(blocking=False):
+            metrics.incr("overflowed")
+            self._discard(key)
+            task.run(args, kwargs, attempt)
+            return
+
+        def work() -> None:
+            self._discard(key)
+            close_old_connections()
+            try:
+                task.run(args, kwargs, attempt)
+            finally:
+                close_old_connections()
+                slots.release()
+
+        executor.submit(work)
+
+    def _discard(self, key: Optional[str]) -> None:
+        if key is not None:
+            with self._lock:
+                self._queued.discard(key)
+
+
+pool = TaskPool()
+os.register_at_fork(after_in_child=pool.reset)
+
+
+class Task:
+    def __init__(
+        self,
+        func: Callable[..., Any],
+        name: str,
+        *,
+        durable: Optional[bool],
+        dedupe: bool,
+        max_attempts: Optional[int],
+    ) -> None:
+        self.func = func
+        self.name = name
+        self._durable = durable
+        self.dedupe = dedupe
+        self._max_attempts = max_attempts
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.func(*args, **kwargs)
+
+    @property
+    def durable(self) -> bool:
+        if self._durable is None:
+            return bool(settings.TASKS_DURABLE)
+        return self._durable
+
+    @property
+    def max_attempts(self) -> int:
+        return self._max_attempts or int(settings.TASKS_MAX_ATTEMPTS)
+
+    def dedupe_key(self, args: tuple, kwargs: dict) -> str:
+        payload = json.dumps([self.name, args, kwargs], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def delay(self, *args: Any, **kwargs: Any) -> None:
+        metrics.incr("enqueued")
+        if self.durable:
+            self.enqueue_durable(args, kwargs)
+        else:
+            transaction.on_commit(lambda: pool.submit(self, args, kwargs))
+
+    def enqueue_durable(self, args: tuple, kwargs: dict) -> None:
+        key = self.dedupe_key(args, kwargs) if self.dedupe else uuid.uuid4().hex
+        QueuedTask.objects.bulk_create(
+            [
+                QueuedTask(
+                    name=self.name,
+                    arguments={"args": list(args), "kwargs": kwargs},
+                    dedupe_key=key,
+                ),
+            ],
+            ignore_conflicts=True,
+        )
+
+    def run(
+        self,
+        args: tuple,
+        kwargs: dict,
+        attempt: int = 1,
+        *,
+        retry: bool = True,
+    ) -> bool:
+        try:
+            self.func(*args, **kwargs)
+        except Exception:
+            logger.exception("Task %s failed (attempt %s)", self.name, attempt)
+            metrics.incr("failed")
+            if retry and attempt < self.max_attempts:
+                metrics.incr("retried")
+                timer = threading.Timer(
+                    retry_delay(attempt),
+                    pool.submit,
+                    args=(self, args, kwargs, attempt + 1),
+                )
+                timer.daemon = True
+                timer.start()
+            return False
+        metrics.incr("executed")
+        return True
+
+
+def retry_delay(attempt: int) -> float:
+    return float(settings.TASKS_RETRY_DELAY * 2 ** (attempt - 1))
+
+
+def task(
+    func: Optional[Callable[..., Any]] = None,
+    *,
+    name: Optional[str] = None,
+    durable: Optional[bool] = None,
+    dedupe: bool = False,
+    max_attempts: Optional[int] = None,
+) -> Any:
+    def decorator(func: Callable[..., Any]) -> Task:
+        task_name = name or f"{func.__module__}.{func.__qualname__}"
+        registry[task_name] = Task(
+            func,
+            task_name,
+            durable=durable,
+            dedupe=dedupe,
+            max_attempts=max_attempts,
+        )
+        return registry[task_name]
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+def claim_queued_tasks(batch_size: int) -> list[QueuedTask]:
+    now = timezone.now()
+    with transaction.atomic():
+        claimed = list(
+            QueuedTask.objects.select_for_update(skip_locked=True)
+            .filter(
+                status__in=[TaskStatus.PENDING, TaskStatus.RUNNING],
+                run_after__lte=now,
+            )
+            .order_by("run_after")[:batch_size],
+        )
+        # Claimable again if its worker dies before run_after.
+        QueuedTask.objects.filter(pk__in=[queued.pk for queued in claimed]).update(
+            status=TaskStatus.RUNNING,
+            run_after=now + timedelta(seconds=settings.TASKS_VISIBILITY_TIMEOUT),
+        )
+    return claimed
+
+
+def run_queued_tasks(batch_size: int) -> int:
+    claimed = claim_queued_tasks(batch_size)
+    for queued in claimed:
+        attempt = queued.attempts + 1
+        registered = registry.get(queued.name)
+        if registered is None:
+            succeeded = False
+            error = f"Unknown task {queued.name!r}."
+            metrics.incr("failed")
+        else:
+            arguments = queued.arguments
+            succeeded = registered.run(
+                tuple(arguments.get("args", [])),
+                arguments.get("kwargs", {}),
+                attempt,
+                retry=False,
+            )
+            error = "" if succeeded else "Task raised an exception."
+
+        if succeeded:
+            queued.delete()
+            continue
+
+        max_attempts = registered.max_attempts if registered else 1
+        queued.attempts = attempt
+        queued.last_error = error
+        if attempt >= max_attempts:
+            queued.status = TaskStatus.FAILED
+        else:
+            metrics.incr("retried")
+            queued.status = TaskStatus.PENDING
+            queued.run_after = timezone.now() + timedelta(seconds=retry_delay(attempt))
+        try:
+            with transaction.atomic():
+                queued.save(
+                    update_fields=["attempts", "last_error", "status", "run_after"],
+                )
+        except IntegrityError:
+            # An identical task was queued meanwhile and will run instead.
+            queued.delete()
+    return len(claimed)
@@ -1,15 +1,40 @@
 # tests/conftest.py
 
-from typing import Callable, List
+from typing import Any, Callable, Iterator, List
 
 import pytest
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from rest_framework.test import APIClient
 
-from blog import PostStatus
+from blog import PostStatus, viewcounts
 from blog.models import Author, Post
 
+
+@pytest.fixture(autouse=True)
+def clear_cache() -> None:
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def response_cache(settings: Any) -> None:
+    settings.RESPONSE_CACHE_ENABLED = True
+
+
+@pytest.fixture(autouse=True)
+def eager_tasks(settings: Any) -> None:
+    # Pool threads cannot see the test's uncommitted data.
+    settings.TASKS_ALWAYS_EAGER = True
+
+
+@pytest.fixture(autouse=True)
+def buffered_views(settings: Any) -> Iterator[None]:
+    settings.VIEW_COUNT_FLUSH_INTERVAL = 0
+    yield
+    viewcounts.counter.clear()
+
+
 # User and Author Factories
 
 @pytest.fixture()
@@ -85,6 +110,14 @@ def multiple_posts(post_factory: Callable, author_factory:Callable) -> List[Post
 def api_client() -> APIClient:
     return APIClient()
 
+@pytest.fixture()
+def authenticated_client(
+    api_client: APIClient,
+    user_factory: Callable[..., User],
+) -> APIClient:
+    api_client.force_authenticate(user=user_factory(username="commenter"))
+    return api_client
+
 @pytest.fixture()
 def authenticated_author_client(
     api_client: Callable[[], APIClient],
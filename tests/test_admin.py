@@ -0,0 +1,76 @@
+import pytest
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from blog.counting import EstimatedCountPaginator
+from blog.models import Comment
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def plain_static_storage(settings):
+    # The manifest only exists after collectstatic.
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+        },
+    }
+
+
+def count_changelist_queries(admin_client, url):
+    cache.clear()
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get(url)
+    assert response.status_code == 200
+    return len(queries)
+
+
+class TestCommentAdmin:
+    def test_changelist_query_count_does_not_grow_with_rows(
+        self, admin_client, post_factory, user_factory,
+    ):
+        post = post_factory()
+        user = user_factory(username="commenter")
+        url = reverse("admin:blog_comment_changelist")
+        Comment.objects.create(post=post, user=user, content="One.")
+        baseline = count_changelist_queries(admin_client, url)
+
+        for index in range(5):
+            Comment.objects.create(post=post, user=user, content=f"More {index}.")
+
+        assert count_changelist_queries(admin_client, url) == baseline
+
+    def test_numeric_search_matches_primary_key(self, admin_client, post_factory):
+        post = post_factory()
+        comment = Comment.objects.create(post=post, content="Find me.")
+        Comment.objects.create(post=post, content="Not me.")
+
+        response = admin_client.get(
+            reverse("admin:blog_comment_changelist"), {"q": str(comment.pk)},
+        )
+
+        assert list(response.context["cl"].result_list) == [comment]
+
+
+class TestPostAdmin:
+    def test_title_search_uses_prefix_lookup(self, admin_client, author_factory, post_factory):
+        author = author_factory()
+        post_factory(author=author, title="Django tips")
+        post_factory(author=author, title="About Django")
+
+        response = admin_client.get(reverse("admin:blog_post_changelist"), {"q": "Django"})
+
+        assert [post.title for post in response.context["cl"].result_list] == ["Django tips"]
+
+
+class TestEstimatedCountPaginator:
+    def test_changelists_use_estimated_count_paginator(self, admin_client, multiple_posts):
+        response = admin_client.get(reverse("admin:blog_post_changelist"))
+
+        assert isinstance(response.context["cl"].paginator, EstimatedCountPaginator)
+        assert response.context["cl"].result_count == len(multiple_posts)
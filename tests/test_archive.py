@@ -0,0 +1,131 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from django.urls import reverse
+from rest_framework import status
+
+from blog import PostStatus
+from blog.models import Post, PostArchiveMonth
+
+pytestmark = pytest.mark.django_db
+
+
+def month_counts() -> dict[tuple[int, int], int]:
+    return {
+        (row.year, row.month): row.post_count
+        for row in PostArchiveMonth.objects.filter(post_count__gt=0)
+    }
+
+
+def move_to(post: Post, year: int, month: int) -> Post:
+    # published_date is auto_now_add, so backdate it and reload the post.
+    PostArchiveMonth.objects.all().delete()
+    Post.objects.filter(pk=post.pk).update(
+        published_date=datetime(year, month, 15, tzinfo=timezone.utc),
+    )
+    return Post.objects.get(pk=post.pk)
+
+
+class TestArchiveCounts:
+    def test_counts_only_published_active_posts(self, multiple_posts):
+        now = datetime.now(tz=timezone.utc)
+
+        assert month_counts() == {(now.year, now.month): 2}
+
+    def test_status_change_moves_post_in_and_out(self, author_factory, post_factory):
+        post = post_factory(author=author_factory(), status=PostStatus.DRAFT)
+        now = datetime.now(tz=timezone.utc)
+        assert month_counts() == {}
+
+        post.status = PostStatus.PUBLISHED
+        post.save()
+        assert month_counts() == {(now.year, now.month): 1}
+
+        post = Post.objects.get(pk=post.pk)
+        post.active = False
+        post.save()
+        assert month_counts() == {}
+
+    def test_delete_decrements_bucket(self, author_factory, post_factory):
+        author = author_factory()
+        post_factory(author=author, title="Kept")
+        post = Post.objects.get(pk=post_factory(author=author, title="Deleted").pk)
+        now = datetime.now(tz=timezone.utc)
+
+        post.delete()
+
+        assert month_counts() == {(now.year, now.month): 1}
+
+    def test_cascade_delete_decrements_bucket(self, author_factory, post_factory):
+        author = author_factory()
+        post_factory(author=author, title="First")
+        post_factory(author=author, title="Second")
+
+        author.delete()
+
+        assert month_counts() == {}
+
+
+class TestArchiveEndpoints:
+    def test_lists_months_newest_first(self, api_client, author_factory, post_factory):
+        author = author_factory()
+        older = post_factory(author=author, title="Older")
+        newer = post_factory(author=author, title="Newer")
+        move_to(older, 2024, 12)
+        move_to(newer, 2025, 6)
+        PostArchiveMonth.objects.bulk_create([
+            PostArchiveMonth(year=2024, month=12, post_count=1),
+            PostArchiveMonth(year=2025, month=6, post_count=1),
+            PostArchiveMonth(year=2025, month=7, post_count=0),
+        ])
+
+        response = api_client.get(reverse("post-archive"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == [
+            {"year": 2025, "month": 6, "count": 1},
+            {"year": 2024, "month": 12, "count": 1},
+        ]
+
+    def test_month_lists_posts_in_bucket(self, api_client, author_factory, post_factory):
+        author = author_factory()
+        june = post_factory(author=author, title="June")
+        july = post_factory(author=author, title="July")
+        draft = post_factory(author=author, title="Draft", status=PostStatus.DRAFT)
+        move_to(june, 2025, 6)
+        move_to(july, 2025, 7)
+        move_to(draft, 2025, 6)
+
+        url = reverse("post-archive-month", kwargs={"year": 2025, "month": 6})
+        response = api_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [post["id"] for post in response.data] == [june.pk]
+
+    def test_december_bucket_ends_at_new_year(self, api_client, author_factory, post_factory):
+        author = author_factory()
+        december = post_factory(author=author, title="December")
+        january = post_factory(author=author, title="January")
+        move_to(december, 2024, 12)
+        move_to(january, 2025, 1)
+
+        url = reverse("post-archive-month", kwargs={"year": 2024, "month": 12})
+        response = api_client.get(url, {"page_size": 10})
+
+        assert response.data["count"] == 1
+        assert response.data["results"][0]["id"] == december.pk
+
+    def test_invalid_month_returns_404(self, api_client):
+        url = reverse("post-archive-month", kwargs={"year": 2025, "month": 13})
+
+        response = api_client.get(url)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_last_representable_year_returns_404(self, api_client):
+        url = reverse("post-archive-month", kwargs={"year": 9999, "month": 12})
+
+        response = api_client.get(url)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,162 @@
+import pytest
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from api.authentication import ResolvedTokenCache, TokenDenyList, issue_token
+from blog.models import Post
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_token_caches():
+    ResolvedTokenCache.clear()
+    TokenDenyList.refresh()
+
+
+class TestTokenObtain:
+    def test_valid_credentials_return_token(self, api_client, author_factory):
+        author = author_factory(name="Token Author")
+
+        response = api_client.post(
+            reverse("token-obtain"),
+            {"username": author.user.username, "password": "password123"},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["token"]
+
+    def test_invalid_credentials_fail(self, api_client, user_factory):
+        user = user_factory(username="tokenuser")
+
+        response = api_client.post(
+            reverse("token-obtain"),
+            {"username": user.username, "password": "wrong"},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class TestSignedTokenAuthentication:
+    def test_create_post_with_token_skips_user_and_session_lookups(
+        self, api_client, author_factory,
+    ):
+        author = author_factory(name="Token Author")
+        token, _ = issue_token(author.user, author.pk)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+        TokenDenyList.refresh()
+        api_client.get(reverse("post-list"))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.post(
+                reverse("post-list"),
+                {"title": "Token Post", "content": "Written with a token."},
+                format="json",
+            )
+
+        assert response.status_code == status.HTTP_201_CREATED, response.data
+        assert Post.objects.get(title="Token Post").author == author
+        assert not any("auth_user" in query["sql"] for query in queries.captured_queries)
+        assert not any("django_session" in query["sql"] for query in queries.captured_queries)
+
+    def test_comment_with_token_is_attributed_to_user(
+        self, api_client, user_factory, post_factory,
+    ):
+        post = post_factory()
+        user = user_factory(username="tokencommenter")
+        token, _ = issue_token(user, None)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+
+        response = api_client.post(
+            reverse("post-comment-create", kwargs={"post_pk": post.pk}),
+            {"content": "Commenting with a token."},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["user"] == "tokencommenter"
+        assert post.comments.get().user == user
+
+    def test_token_without_author_cannot_create_post(self, api_client, user_factory):
+        user = user_factory(username="noauthor")
+        token, _ = issue_token(user, None)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+
+        response = api_client.post(
+            reverse("post-list"),
+            {"title": "Nope", "content": "Nope."},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_tampered_token_is_rejected(self, api_client, user_factory):
+        token, _ = issue_token(user_factory(username="tamper"), None)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Token {token}x")
+
+        response = api_client.get(reverse("post-list"))
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_expired_token_is_rejected(self, api_client, user_factory, settings):
+        token, _ = issue_token(user_factory(username="expired"), None)
+        settings.API_TOKEN_TTL = -1
+        api_client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+
+        response = api_client.get(reverse("post-list"))
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert "expired" in str(response.data["detail"])
+
+
+class TestTokenUserState:
+    def test_deactivated_user_is_rejected(self, api_client, user_factory):
+        user = user_factory(username="leaver")
+        token, _ = issue_token(user, None)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+        assert api_client.get(reverse("post-list")).status_code == status.HTTP_200_OK
+
+        user.is_active = False
+        user.save()
+
+        response = api_client.get(reverse("post-list"))
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_demoted_user_loses_staff_access(self, api_client, user_factory):
+        user = user_factory(username="former-admin", is_staff=True)
+        token, _ = issue_token(user, None)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+        assert api_client.get(reverse("profile-list")).status_code == status.HTTP_200_OK
+
+        user.is_staff = False
+        user.save()
+
+        response = api_client.get(reverse("profile-list"))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+class TestTokenRevocation:
+    def test_revoked_token_is_rejected(self, api_client, user_factory):
+        token, _ = issue_token(user_factory(username="revoked"), None)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+
+        response = api_client.post(reverse("token-revoke"))
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+        response = api_client.get(reverse("post-list"))
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert "revoked" in str(response.data["detail"])
+
+    def test_revocation_is_picked_up_by_other_workers(self, user_factory):
+        _, claims = issue_token(user_factory(username="revoked"), None)
+        TokenDenyList.revoke(claims)
+        TokenDenyList._jtis = frozenset()
+
+        TokenDenyList.refresh()
+
+        assert TokenDenyList.contains(claims["jti"])
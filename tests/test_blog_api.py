@@ -227,3 +227,119 @@ class TestCommentCreation:
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert expected_error in str(response.data['content'])
         assert post.comments.count() == 0
+
+
+class TestPostBatchRetrieval:
+    def test_filter_by_ids_returns_only_requested_posts(self, api_client, multiple_posts):
+        wanted = [multiple_posts[0].pk, multiple_posts[1].pk]
+        url = reverse("post-list")
+
+        response = api_client.get(url, {"ids": ",".join(map(str, wanted))})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert sorted(post["id"] for post in response.data) == sorted(wanted)
+
+    def test_filter_by_too_many_ids_fails(self, api_client, settings):
+        settings.POST_BATCH_MAX_SIZE = 2
+        url = reverse("post-list")
+
+        response = api_client.get(url, {"ids": "1,2,3"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "At most 2 ids" in str(response.data["ids"])
+
+
+class TestCommentBulkCreation:
+    def test_bulk_create_inserts_all_valid_comments(self, authenticated_client, post_factory):
+        post = post_factory(active=True)
+        url = reverse("post-comment-bulk-create", kwargs={"post_pk": post.pk})
+        data = [{"content": "First imported."}, {"content": "Second imported."}]
+
+        response = authenticated_client.post(url, data, format="json")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert [c["content"] for c in response.data["created"]] == [
+            "First imported.",
+            "Second imported.",
+        ]
+        assert response.data["errors"] == []
+        assert post.comments.count() == 2
+
+    def test_bulk_create_reports_errors_per_item(self, authenticated_client, post_factory):
+        post = post_factory(active=True)
+        url = reverse("post-comment-bulk-create", kwargs={"post_pk": post.pk})
+        data = [{"content": "Valid comment."}, {"content": "x"}]
+
+        response = authenticated_client.post(url, data, format="json")
+
+        assert response.status_code == status.HTTP_207_MULTI_STATUS
+        assert len(response.data["created"]) == 1
+        assert response.data["errors"][0]["index"] == 1
+        assert "at least 2 characters" in str(response.data["errors"][0]["errors"])
+        assert post.comments.count() == 1
+
+    def test_bulk_create_with_no_valid_items_fails(self, authenticated_client, post_factory):
+        post = post_factory(active=True)
+        url = reverse("post-comment-bulk-create", kwargs={"post_pk": post.pk})
+
+        response = authenticated_client.post(url, [{"content": ""}], format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert post.comments.count() == 0
+
+    def test_bulk_create_rejects_oversized_batches(self, authenticated_client, post_factory, settings):
+        settings.COMMENT_BULK_MAX_SIZE = 1
+        post = post_factory(active=True)
+        url = reverse("post-comment-bulk-create", kwargs={"post_pk": post.pk})
+        data = [{"content": "One."}, {"content": "Two."}]
+
+        response = authenticated_client.post(url, data, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert post.comments.count() == 0
+
+    def test_bulk_create_requires_authentication(self, api_client, post_factory):
+        post = post_factory(active=True)
+        url = reverse("post-comment-bulk-create", kwargs={"post_pk": post.pk})
+
+        response = api_client.post(url, [{"content": "Anonymous."}], format="json")
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert post.comments.count() == 0
+
+    def test_bulk_create_is_throttled(self, authenticated_client, post_factory, settings):
+        settings.COMMENT_BULK_THROTTLE_RATE = "1/hour"
+        post = post_factory(active=True)
+        url = reverse("post-comment-bulk-create", kwargs={"post_pk": post.pk})
+
+        authenticated_client.post(url, [{"content": "First batch."}], format="json")
+        response = authenticated_client.post(
+            url, [{"content": "Second batch."}], format="json",
+        )
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert post.comments.count() == 1
+
+    def test_bulk_create_records_trending_score(
+        self, authenticated_client, post_factory, settings,
+        django_capture_on_commit_callbacks,
+    ):
+        post = post_factory(active=True)
+        url = reverse("post-comment-bulk-create", kwargs={"post_pk": post.pk})
+        data = [{"content": "First imported."}, {"content": "Second imported."}]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            authenticated_client.post(url, data, format="json")
+        post.refresh_from_db()
+
+        assert post.trending_score == (
+            settings.TRENDING_NEW_POST_SCORE + 2 * settings.TRENDING_COMMENT_SCORE
+        )
+
+    def test_bulk_create_on_inactive_post_fails(self, authenticated_client, post_factory):
+        post = post_factory(active=False)
+        url = reverse("post-comment-bulk-create", kwargs={"post_pk": post.pk})
+
+        response = authenticated_client.post(url, [{"content": "Nope."}], format="json")
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
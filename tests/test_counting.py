@@ -0,0 +1,91 @@
+import pytest
+
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+
+from blog import counting
+from blog.models import Post
+
+pytestmark = pytest.mark.django_db
+
+
+class TestCountQueryset:
+    def test_small_results_are_counted_exactly(self, multiple_posts):
+        result = counting.count_queryset(Post.objects.filter(active=True))
+
+        assert result == counting.CountResult(count=3, approximate=False)
+
+    def test_large_filtered_results_use_explain_estimate(
+        self, monkeypatch, settings, multiple_posts,
+    ):
+        settings.EXACT_COUNT_THRESHOLD = 2
+        monkeypatch.setattr(counting, "explain_row_estimate", lambda queryset: 1_000_000)
+
+        result = counting.count_queryset(Post.objects.filter(active=True))
+
+        assert result == counting.CountResult(count=1_000_000, approximate=True)
+
+    def test_large_unfiltered_results_use_table_statistics(
+        self, monkeypatch, settings, multiple_posts,
+    ):
+        settings.EXACT_COUNT_THRESHOLD = 2
+        monkeypatch.setattr(counting, "estimated_table_rows", lambda model: 5_000_000)
+
+        result = counting.count_queryset(Post.objects.all())
+
+        assert result == counting.CountResult(count=5_000_000, approximate=True)
+
+    def test_estimate_never_undercounts_rows_already_seen(
+        self, monkeypatch, settings, multiple_posts,
+    ):
+        settings.EXACT_COUNT_THRESHOLD = 2
+        monkeypatch.setattr(counting, "explain_row_estimate", lambda queryset: 1)
+
+        result = counting.count_queryset(Post.objects.filter(active=True))
+
+        assert result.count == 3
+
+    def test_counts_are_cached_per_filter_combination(self, author_factory, post_factory):
+        author = author_factory()
+        post_factory(author=author, title="First")
+        counting.count_queryset(Post.objects.filter(title__icontains="First"))
+
+        post_factory(author=author, title="First again")
+
+        assert counting.count_queryset(Post.objects.filter(title__icontains="First")).count == 1
+        assert counting.count_queryset(Post.objects.filter(title__icontains="again")).count == 1
+
+    def test_planner_estimates_come_from_postgres(self, multiple_posts):
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE blog_post")
+
+        assert counting.estimated_table_rows(Post) == len(multiple_posts)
+        assert counting.explain_row_estimate(Post.objects.filter(active=True)) >= 1
+
+
+class TestPostListPagination:
+    def test_list_is_unpaginated_by_default(self, api_client, multiple_posts):
+        response = api_client.get(reverse("post-list"))
+
+        assert isinstance(response.data, list)
+
+    def test_page_size_returns_count_metadata(self, api_client, multiple_posts):
+        response = api_client.get(reverse("post-list"), {"page_size": 2})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 3
+        assert response.data["count_is_approximate"] is False
+        assert len(response.data["results"]) == 2
+        assert response.data["next"] is not None
+
+    def test_large_counts_are_flagged_as_approximate(
+        self, api_client, monkeypatch, settings, multiple_posts,
+    ):
+        settings.EXACT_COUNT_THRESHOLD = 1
+        monkeypatch.setattr(counting, "explain_row_estimate", lambda queryset: 250_000)
+
+        response = api_client.get(reverse("post-list"), {"page_size": 2})
+
+        assert response.data["count"] == 250_000
+        assert response.data["count_is_approximate"] is True
@@ -0,0 +1,60 @@
+from io import StringIO
+
+import pytest
+
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from blog_system import health
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def reset_readiness():
+    health.Readiness.ready = False
+    yield
+    health.Readiness.ready = False
+
+
+class TestProbes:
+    def test_liveness_always_succeeds(self, client):
+        response = client.get(reverse("health-live"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"status": "alive"}
+
+    def test_readiness_runs_checks_once(self, client, monkeypatch):
+        response = client.get(reverse("health-ready"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["checks"] == {
+            "database": True,
+            "migrations": True,
+            "urls": True,
+        }
+
+        monkeypatch.setitem(health.READINESS_CHECKS, "database", lambda: False)
+        response = client.get(reverse("health-ready"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"status": "ready"}
+
+    def test_readiness_reports_failed_checks(self, client, monkeypatch):
+        monkeypatch.setitem(health.READINESS_CHECKS, "migrations", lambda: False)
+
+        response = client.get(reverse("health-ready"))
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.json()["status"] == "warming"
+        assert response.json()["checks"]["migrations"] is False
+
+
+class TestMigrateOnce:
+    def test_skips_when_nothing_is_pending(self):
+        out = StringIO()
+
+        call_command("migrate_once", stdout=out)
+
+        assert "No migrations to apply." in out.getvalue()
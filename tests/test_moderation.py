@@ -0,0 +1,126 @@
+import time
+
+import pytest
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from blog.models import BlockedPhrase, Comment, content_hash
+from blog.moderation import BlocklistMatcher, compile_blocklist
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def fresh_matcher():
+    BlocklistMatcher.invalidate()
+    yield
+    BlocklistMatcher.invalidate()
+
+
+def comment_url(post):
+    return reverse("post-comment-create", kwargs={"post_pk": post.pk})
+
+
+class TestBlocklistMatcher:
+    def test_matches_whole_phrases_case_insensitively(self):
+        pattern = compile_blocklist(["buy now", "spam", "spammer"])
+
+        assert pattern.search("please buy now").group(0) == "buy now"
+        assert pattern.search("a spammer here").group(0) == "spammer"
+        assert pattern.search("spamming is fine") is None
+
+    def test_large_blocklist_stays_fast(self):
+        pattern = compile_blocklist([f"blocked phrase {number}" for number in range(20_000)])
+        text = "an ordinary comment about the post " * 20
+
+        started = time.perf_counter()
+        for _ in range(100):
+            assert pattern.search(text) is None
+        elapsed = (time.perf_counter() - started) / 100
+
+        assert pattern.search("this has blocked phrase 19999 in it") is not None
+        assert elapsed < 0.005
+
+    def test_recompiles_when_phrases_change(self):
+        assert BlocklistMatcher.find("cheap pills here") is None
+
+        BlockedPhrase.objects.create(phrase="  Cheap   PILLS ")
+
+        assert BlocklistMatcher.find("cheap pills here") == "cheap pills"
+
+
+class TestCommentModeration:
+    def test_blocked_phrase_is_rejected(self, api_client, post_factory):
+        BlockedPhrase.objects.create(phrase="casino bonus")
+        post = post_factory()
+
+        response = api_client.post(
+            comment_url(post), {"content": "Get your CASINO bonus today"}, format="json",
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "blocked phrase" in str(response.data["content"])
+
+    def test_recent_duplicate_is_rejected(self, api_client, post_factory):
+        post = post_factory()
+        api_client.post(comment_url(post), {"content": "Nice post!"}, format="json")
+
+        response = api_client.post(
+            comment_url(post), {"content": "nice   POST!"}, format="json",
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert Comment.objects.count() == 1
+
+    def test_duplicate_on_another_post_is_allowed(
+        self, api_client, author_factory, post_factory,
+    ):
+        author = author_factory()
+        first = post_factory(author=author, title="First")
+        second = post_factory(author=author, title="Second")
+        api_client.post(comment_url(first), {"content": "Nice post!"}, format="json")
+
+        response = api_client.post(
+            comment_url(second), {"content": "Nice post!"}, format="json",
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+
+    def test_duplicate_by_another_user_is_allowed(
+        self, authenticated_client, post_factory,
+    ):
+        post = post_factory()
+        APIClient().post(comment_url(post), {"content": "Nice post!"}, format="json")
+
+        response = authenticated_client.post(
+            comment_url(post), {"content": "Nice post!"}, format="json",
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+
+    def test_old_duplicate_is_allowed(self, api_client, post_factory, settings):
+        settings.MODERATION_DUPLICATE_WINDOW = 0
+        post = post_factory()
+        api_client.post(comment_url(post), {"content": "Nice post!"}, format="json")
+
+        response = api_client.post(comment_url(post), {"content": "Nice post!"}, format="json")
+
+        assert response.status_code == status.HTTP_201_CREATED
+
+    def test_bulk_rejects_duplicates_within_batch(self, authenticated_client, post_factory):
+        post = post_factory()
+
+        response = authenticated_client.post(
+            reverse("post-comment-bulk-create", kwargs={"post_pk": post.pk}),
+            [{"content": "Same words"}, {"content": "same words"}, {"content": "Other"}],
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_207_MULTI_STATUS
+        assert [error["index"] for error in response.data["errors"]] == [1]
+        assert set(Comment.objects.values_list("content_hash", flat=True)) == {
+            content_hash("Same words"),
+            content_hash("Other"),
+        }
@@ -0,0 +1,123 @@
+import pytest
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from api import profiling
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def profile_dir(settings, tmp_path):
+    settings.PROFILE_DIR = str(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture()
+def staff_client(user_factory):
+    client = APIClient()
+    client.force_login(user_factory(username="staff", is_staff=True))
+    return client
+
+
+class TestProfilingMiddleware:
+    def test_staff_request_is_profiled(self, staff_client, post_factory, profile_dir):
+        post = post_factory()
+
+        response = staff_client.get(
+            reverse("post-detail", kwargs={"pk": post.pk}),
+            HTTP_X_PROFILE="1",
+        )
+
+        profile_id = response["X-Profile-Id"]
+        summary = profiling.load_profile(profile_id)
+        assert summary["status"] == status.HTTP_200_OK
+        assert summary["trigger"] == "requested"
+        assert summary["query_count"] == len(summary["queries"]) > 0
+        assert summary["functions"]
+        assert (profile_dir / f"{profile_id}.prof").exists()
+
+    def test_flag_is_ignored_for_non_staff(self, api_client, post_factory, profile_dir):
+        post = post_factory()
+
+        response = api_client.get(
+            reverse("post-detail", kwargs={"pk": post.pk}), {"profile": "1"},
+        )
+
+        assert "X-Profile-Id" not in response
+        assert not list(profile_dir.iterdir())
+
+    def test_sampled_requests_below_threshold_are_dropped(
+        self, api_client, settings, profile_dir,
+    ):
+        settings.PROFILE_SAMPLE_RATE = 1.0
+        settings.PROFILE_SLOW_THRESHOLD_MS = 60_000
+
+        api_client.get(reverse("post-list"))
+
+        assert not list(profile_dir.iterdir())
+
+    def test_sampled_slow_requests_are_kept(self, api_client, settings):
+        settings.PROFILE_SAMPLE_RATE = 1.0
+        settings.PROFILE_SLOW_THRESHOLD_MS = 0
+
+        response = api_client.get(reverse("post-list"))
+
+        assert profiling.load_profile(response["X-Profile-Id"])["trigger"] == "sampled"
+
+    def test_old_profiles_are_pruned(self, staff_client, settings, profile_dir):
+        settings.PROFILE_KEEP = 2
+
+        for _ in range(3):
+            staff_client.get(reverse("post-list"), HTTP_X_PROFILE="1")
+
+        assert len(list(profile_dir.glob("*.json"))) == 2
+        assert len(list(profile_dir.glob("*.prof"))) == 2
+
+
+    def test_async_requests_pass_through(self, settings, profile_dir):
+        settings.PROFILE_SAMPLE_RATE = 1.0
+        settings.PROFILE_SLOW_THRESHOLD_MS = 0
+
+        async def view(_request):
+            return HttpResponse("ok")
+
+        middleware = profiling.ProfilingMiddleware(view)
+        response = async_to_sync(middleware)(RequestFactory().get("/"))
+
+        assert iscoroutinefunction(middleware)
+        assert response.content == b"ok"
+        assert not list(profile_dir.iterdir())
+
+class TestProfileEndpoints:
+    def test_staff_can_list_and_download(self, staff_client):
+        profile_id = staff_client.get(reverse("post-list"), HTTP_X_PROFILE="1")["X-Profile-Id"]
+
+        listing = staff_client.get(reverse("profile-list"))
+        detail = staff_client.get(reverse("profile-detail", kwargs={"profile_id": profile_id}))
+        download = staff_client.get(
+            reverse("profile-download", kwargs={"profile_id": profile_id}),
+        )
+
+        assert [summary["id"] for summary in listing.data] == [profile_id]
+        assert "queries" not in listing.data[0]
+        assert detail.data["path"] == reverse("post-list")
+        assert download.status_code == status.HTTP_200_OK
+        assert b"".join(download.streaming_content)
+
+    def test_non_staff_is_forbidden(self, authenticated_author_client):
+        client, _ = authenticated_author_client
+
+        response = client.get(reverse("profile-list"))
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_unknown_or_malformed_id_returns_404(self, staff_client):
+        for profile_id in ("20250101000000000000-deadbeef", "..%2F..%2Fsettings"):
+            url = reverse("profile-download", kwargs={"profile_id": profile_id})
+            assert staff_client.get(url).status_code == status.HTTP_404_NOT_FOUND
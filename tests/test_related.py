@@ -0,0 +1,130 @@
+from io import StringIO
+
+import numpy as np
+import pytest
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from blog import PostStatus
+from blog.models import PostVector, RelatedPost
+from blog.related import top_neighbours, vectorize
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture()
+def topical_posts(author_factory, post_factory):
+    author = author_factory()
+    return {
+        "django": post_factory(
+            author=author,
+            title="Django ORM performance",
+            content="Query optimisation with select_related and database indexes.",
+        ),
+        "orm": post_factory(
+            author=author,
+            title="Faster Django ORM queries",
+            content="Database indexes and select_related reduce query counts.",
+        ),
+        "baking": post_factory(
+            author=author,
+            title="Sourdough baking",
+            content="Flour, water and a starter make a crusty loaf of bread.",
+        ),
+        "bread": post_factory(
+            author=author,
+            title="Bread baking basics",
+            content="A crusty sourdough loaf needs a lively starter and flour.",
+        ),
+    }
+
+
+def related_ids(post_pk):
+    return list(
+        RelatedPost.objects.filter(post_id=post_pk)
+        .order_by("rank")
+        .values_list("related_id", flat=True),
+    )
+
+
+class TestVectors:
+    def test_vectors_are_normalized(self):
+        vector = vectorize("Title", "Some words and some more words", 64)
+
+        assert vector.dtype == np.float32
+        assert np.isclose(np.linalg.norm(vector), 1.0)
+
+    def test_top_neighbours_are_sorted(self):
+        scores = np.array([[0.1, 0.9, 0.5, 0.7]], dtype=np.float32)
+
+        columns, values = top_neighbours(scores, 2)
+
+        assert columns.tolist() == [[1, 3]]
+        assert np.allclose(values, [[0.9, 0.7]])
+
+
+class TestBuildRelatedPosts:
+    def test_full_build_finds_topical_neighbours(self, topical_posts):
+        call_command("build_related_posts", "--block-size", "2", stdout=StringIO())
+
+        assert related_ids(topical_posts["django"].pk)[0] == topical_posts["orm"].pk
+        assert related_ids(topical_posts["baking"].pk)[0] == topical_posts["bread"].pk
+        assert topical_posts["django"].pk not in related_ids(topical_posts["django"].pk)
+
+    def test_drafts_are_not_recommended(self, topical_posts, post_factory):
+        draft = post_factory(
+            author=topical_posts["orm"].author,
+            title="Django ORM performance draft",
+            content="Query optimisation with select_related and database indexes.",
+            status=PostStatus.DRAFT,
+        )
+
+        call_command("build_related_posts", stdout=StringIO())
+
+        assert draft.pk not in related_ids(topical_posts["django"].pk)
+        assert not PostVector.objects.filter(post=draft).exists()
+
+    def test_incremental_adds_new_posts(self, topical_posts, post_factory):
+        call_command("build_related_posts", "--k", "1", stdout=StringIO())
+        newcomer = post_factory(
+            author=topical_posts["orm"].author,
+            title="Rye bread baking",
+            content="Sourdough starter, rye flour and water for a crusty loaf of bread.",
+        )
+
+        out = StringIO()
+        call_command("build_related_posts", "--incremental", "--k", "1", stdout=out)
+
+        assert "Vectorized 1 posts" in out.getvalue()
+        assert related_ids(newcomer.pk) in (
+            [topical_posts["baking"].pk],
+            [topical_posts["bread"].pk],
+        )
+        assert related_ids(topical_posts["django"].pk) == [topical_posts["orm"].pk]
+
+
+class TestRelatedEndpoint:
+    def test_returns_precomputed_neighbours_in_one_query(self, api_client, topical_posts):
+        call_command("build_related_posts", stdout=StringIO())
+        url = reverse("post-related", kwargs={"pk": topical_posts["django"].pk})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data[0]["id"] == topical_posts["orm"].pk
+        assert len(queries) == 1
+
+    def test_unknown_post_returns_404(self, api_client):
+        response = api_client.get(reverse("post-related", kwargs={"pk": 999_999}))
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_non_numeric_id_returns_404(self, api_client):
+        response = api_client.get("/api/v1/posts/abc/related/")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
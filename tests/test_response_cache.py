@@ -0,0 +1,172 @@
+import threading
+
+from io import StringIO
+
+import pytest
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from api import cache as response_cache
+from api import warmup
+from blog.models import Comment
+
+pytestmark = pytest.mark.django_db
+
+
+class TestPostResponseCache:
+    def test_detail_is_served_from_cache(self, api_client, post_factory):
+        post = post_factory()
+        url = reverse("post-detail", kwargs={"pk": post.pk})
+        first = api_client.get(url)
+
+        with CaptureQueriesContext(connection) as queries:
+            second = api_client.get(url)
+
+        assert second.status_code == status.HTTP_200_OK
+        assert second.data == first.data
+        assert len(queries) == 0
+
+    def test_new_comment_invalidates_detail(
+        self, api_client, post_factory, django_capture_on_commit_callbacks,
+    ):
+        post = post_factory()
+        url = reverse("post-detail", kwargs={"pk": post.pk})
+        api_client.get(url)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.post(
+                reverse("post-comment-create", kwargs={"post_pk": post.pk}),
+                {"content": "Fresh comment."},
+                format="json",
+            )
+
+        assert len(api_client.get(url).data["comments"]) == 1
+
+    def test_post_update_invalidates_lists(
+        self, api_client, post_factory, django_capture_on_commit_callbacks,
+    ):
+        post = post_factory(title="Before")
+        api_client.get(reverse("post-list"))
+
+        with django_capture_on_commit_callbacks(execute=True):
+            post.title = "After"
+            post.save()
+
+        assert api_client.get(reverse("post-list")).data[0]["title"] == "After"
+
+    def test_list_entries_are_keyed_by_query(self, api_client, multiple_posts):
+        all_posts = api_client.get(reverse("post-list"))
+        filtered = api_client.get(reverse("post-list"), {"title": "Author One"})
+
+        assert len(all_posts.data) == 3
+        assert len(filtered.data) == 1
+
+    def test_invalidation_during_fill_wins(self, post_factory):
+        post = post_factory()
+        key = response_cache.post_detail_key(post.pk)
+
+        def fill():
+            response_cache.invalidate_post(post.pk, lists=False)
+            return {"data": "stale"}
+
+        response_cache.get_or_fill(key, fill)
+
+        assert response_cache.post_detail_key(post.pk) != key
+        assert cache.get(response_cache.post_detail_key(post.pk)) is None
+
+    def test_missing_post_is_not_cached(self, api_client):
+        url = reverse("post-detail", kwargs={"pk": 999_999})
+
+        assert api_client.get(url).status_code == status.HTTP_404_NOT_FOUND
+        assert cache.get(response_cache.post_detail_key(999_999)) is None
+
+    def test_disabled_cache_serves_live_responses(
+        self, api_client, post_factory, settings,
+    ):
+        settings.RESPONSE_CACHE_ENABLED = False
+        post = post_factory()
+        url = reverse("post-detail", kwargs={"pk": post.pk})
+        api_client.get(url)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(queries) > 0
+        assert cache.get(response_cache.post_detail_key(post.pk)) is None
+
+
+class TestSingleFlight:
+    def test_concurrent_misses_fill_once(self):
+        calls = []
+        started = threading.Barrier(5)
+
+        def fill():
+            calls.append(1)
+            return {"value": 1}
+
+        def worker():
+            started.wait()
+            response_cache.get_or_fill("single-flight", fill)
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert response_cache._fill_locks == {}
+
+    def test_waits_for_fill_in_another_process(self, settings):
+        settings.RESPONSE_CACHE_FILL_TIMEOUT = 1
+        cache.set("elsewhere:filling", 1)
+        threading.Timer(0.1, cache.set, args=("elsewhere", {"value": 2})).start()
+
+        value = response_cache.get_or_fill("elsewhere", lambda: {"value": 3})
+
+        assert value == {"value": 2}
+        assert response_cache._fill_locks == {}
+
+
+@pytest.mark.django_db(transaction=True)
+class TestWarmCache:
+    def test_command_fills_hot_posts_and_list_pages(self, post_factory, author_factory):
+        author = author_factory()
+        posts = [post_factory(author=author, title=f"Post {i}") for i in range(3)]
+        Comment.objects.create(post=posts[0], content="Comment.")
+        cache.clear()
+        out = StringIO()
+
+        call_command("warm_cache", "--posts", "2", "--pages", "1", stdout=out)
+
+        assert "Warmed 3 entries" in out.getvalue()
+        assert cache.get(response_cache.post_detail_key(posts[2].pk)) is not None
+        assert cache.get(response_cache.post_detail_key(posts[0].pk)) is None
+        assert warmup.finished.is_set()
+
+    def test_warmed_list_matches_proxied_requests(self, api_client, post_factory):
+        post_factory()
+        warmup.warm_cache(post_limit=0, pages=1, page_size=20, workers=1, budget=10)
+        url = warmup.warmup_urls([], pages=1, page_size=20)[0]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url, HTTP_HOST=settings.PUBLIC_HOST)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(queries) == 0
+
+    def test_budget_stops_new_fills(self, post_factory, author_factory):
+        author = author_factory()
+        post_factory(author=author)
+
+        report = warmup.warm_cache(post_limit=10, pages=1, page_size=10, workers=1, budget=0)
+
+        assert report.warmed == []
+        assert report.skipped == 2
@@ -0,0 +1,170 @@
+from datetime import timedelta
+from io import StringIO
+
+import psycopg2
+import pytest
+
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from blog import PostStatus, scheduling
+from blog.models import Post, PostArchiveMonth, Tag
+
+pytestmark = pytest.mark.django_db
+
+
+def schedule(post: Post, publish_at) -> Post:
+    Post.objects.filter(pk=post.pk).update(publish_at=publish_at)
+    return Post.objects.get(pk=post.pk)
+
+
+@pytest.fixture()
+def drafts(author_factory, post_factory):
+    author = author_factory()
+    return [
+        post_factory(author=author, title=f"Draft {index}", status=PostStatus.DRAFT)
+        for index in range(3)
+    ]
+
+
+class TestPublishDue:
+    def test_publishes_only_due_drafts(self, drafts):
+        due_at = timezone.now() - timedelta(minutes=1)
+        due = schedule(drafts[0], due_at)
+        later = schedule(drafts[1], timezone.now() + timedelta(days=1))
+
+        out = StringIO()
+        call_command("publish_due", stdout=out)
+
+        due.refresh_from_db()
+        assert "Published 1 scheduled posts" in out.getvalue()
+        assert due.status == PostStatus.PUBLISHED
+        assert due.published_date == due_at
+        assert due.publish_at is None
+        assert Post.objects.get(pk=later.pk).status == PostStatus.DRAFT
+        assert Post.objects.get(pk=drafts[2].pk).status == PostStatus.DRAFT
+
+    def test_publishes_every_batch(self, drafts):
+        for draft in drafts:
+            schedule(draft, timezone.now() - timedelta(minutes=1))
+
+        assert scheduling.publish_due(batch_size=2) == 3
+        assert not Post.objects.filter(status=PostStatus.DRAFT).exists()
+
+    def test_updates_archive_and_tag_counts(self, drafts):
+        due_at = timezone.now() - timedelta(minutes=1)
+        tag = Tag.objects.create(name="News", slug="news")
+        tag.posts.add(*drafts[:2])
+        schedule(drafts[0], due_at)
+        schedule(drafts[1], due_at)
+
+        scheduling.publish_due(batch_size=10)
+
+        published = timezone.localtime(due_at)
+        month = PostArchiveMonth.objects.get(year=published.year, month=published.month)
+        assert month.post_count == 2
+        assert Tag.objects.get(pk=tag.pk).post_count == 2
+
+    def test_stale_publish_by_hand_is_not_counted_twice(self, drafts):
+        due_at = timezone.now() - timedelta(minutes=1)
+        tag = Tag.objects.create(name="News", slug="news")
+        tag.posts.add(drafts[0])
+        stale = schedule(drafts[0], due_at)
+        scheduling.publish_due(batch_size=10)
+
+        stale.status = PostStatus.PUBLISHED
+        stale.publish_at = None
+        stale.save()
+
+        assert PostArchiveMonth.objects.get().post_count == 1
+        assert Tag.objects.get(pk=tag.pk).post_count == 1
+
+    def test_stale_delete_after_publish_is_counted(self, drafts):
+        stale = schedule(drafts[0], timezone.now() - timedelta(minutes=1))
+        scheduling.publish_due(batch_size=10)
+
+        stale.delete()
+
+        assert PostArchiveMonth.objects.get().post_count == 0
+
+    def test_invalidates_cached_responses(
+        self, api_client, drafts, django_capture_on_commit_callbacks,
+    ):
+        post = schedule(drafts[0], timezone.now() - timedelta(minutes=1))
+        url = reverse("post-detail", kwargs={"pk": post.pk})
+        assert api_client.get(url).data["status"] == PostStatus.DRAFT
+
+        with django_capture_on_commit_callbacks(execute=True):
+            scheduling.publish_due(batch_size=10)
+
+        assert api_client.get(url).data["status"] == PostStatus.PUBLISHED
+
+
+@pytest.mark.django_db(transaction=True)
+class TestConcurrentWorkers:
+    def test_rows_locked_by_another_worker_are_skipped(self, drafts):
+        for draft in drafts[:2]:
+            schedule(draft, timezone.now() - timedelta(minutes=1))
+        other_worker = psycopg2.connect(**connection.get_connection_params())
+        try:
+            with other_worker.cursor() as cursor:
+                cursor.execute(
+                    "SELECT id FROM blog_post WHERE id = %s FOR UPDATE",
+                    [drafts[0].pk],
+                )
+                published = scheduling.publish_due_batch(batch_size=10)
+        finally:
+            other_worker.close()
+
+        assert published == [drafts[1].pk]
+
+
+class TestScheduleValidation:
+    def test_create_scheduled_draft(self, authenticated_author_client):
+        client, _ = authenticated_author_client
+        publish_at = timezone.now() + timedelta(hours=1)
+
+        response = client.post(
+            reverse("post-list"),
+            {"title": "Later", "content": "Content.", "publish_at": publish_at},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert Post.objects.get(title="Later").publish_at == publish_at
+
+    def test_past_publish_time_is_rejected(self, authenticated_author_client):
+        client, _ = authenticated_author_client
+
+        response = client.post(
+            reverse("post-list"),
+            {
+                "title": "Past",
+                "content": "Content.",
+                "publish_at": timezone.now() - timedelta(hours=1),
+            },
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "publish_at" in response.data
+
+    def test_published_posts_cannot_be_scheduled(self, authenticated_author_client):
+        client, _ = authenticated_author_client
+
+        response = client.post(
+            reverse("post-list"),
+            {
+                "title": "Now",
+                "content": "Content.",
+                "status": PostStatus.PUBLISHED,
+                "publish_at": timezone.now() + timedelta(hours=1),
+            },
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "publish_at" in response.data
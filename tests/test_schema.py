@@ -0,0 +1,67 @@
+from io import StringIO
+
+import pytest
+
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from api import schema
+
+
+@pytest.fixture(autouse=True)
+def schema_cache_dir(settings, tmp_path):
+    settings.SCHEMA_CACHE_DIR = tmp_path
+    schema.clear_schema_documents()
+    yield tmp_path
+    schema.clear_schema_documents()
+
+
+class TestBuildSchemaCache:
+    def test_command_writes_every_format(self, schema_cache_dir):
+        out = StringIO()
+
+        call_command("build_schema_cache", stdout=out)
+
+        assert (schema_cache_dir / "openapi.yaml").exists()
+        assert (schema_cache_dir / "openapi.json").exists()
+        assert "openapi.json" in out.getvalue()
+
+
+class TestCachedSchemaView:
+    def test_schema_is_served_from_disk(self, client, schema_cache_dir):
+        call_command("build_schema_cache", stdout=StringIO())
+        (schema_cache_dir / "openapi.json").write_bytes(b'{"cached": true}')
+        schema.clear_schema_documents()
+
+        response = client.get(reverse("schema"), {"format": "json"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == b'{"cached": true}'
+        assert response["ETag"].startswith('"')
+
+    def test_schema_is_generated_when_cache_is_missing(self, client, schema_cache_dir):
+        response = client.get(reverse("schema"), {"format": "json"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert b"/api/v1/posts/" in response.content
+        assert (schema_cache_dir / "openapi.json").exists()
+
+    def test_matching_etag_returns_not_modified(self, client):
+        etag = client.get(reverse("schema"))["ETag"]
+
+        response = client.get(reverse("schema"), HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response["ETag"] == etag
+        assert response.content == b""
+
+    def test_debug_renders_without_the_cache(self, client, schema_cache_dir, settings):
+        settings.DEBUG = True
+        call_command("build_schema_cache", stdout=StringIO())
+        (schema_cache_dir / "openapi.json").write_bytes(b'{"cached": true}')
+        schema.clear_schema_documents()
+
+        response = client.get(reverse("schema"), {"format": "json"})
+
+        assert b"/api/v1/posts/" in response.content
@@ -0,0 +1,230 @@
+import asyncio
+import json
+import select
+
+import psycopg2
+import pytest
+
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework import status
+
+from api import streams
+from blog.models import Comment
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture()
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+def drain(loop, subscriber) -> list[dict]:
+    loop.run_until_complete(asyncio.sleep(0))
+    events = []
+    while not subscriber.queue.empty():
+        events.append(subscriber.queue.get_nowait())
+    return events
+
+
+class TestCommentHub:
+    def test_publish_reaches_only_subscribers_of_the_post(self, loop):
+        hub = streams.CommentHub()
+        first = hub.subscribe(1, loop)
+        second = hub.subscribe(1, loop)
+        other = hub.subscribe(2, loop)
+
+        hub.publish(1, [{"id": 10}])
+
+        assert drain(loop, first) == [{"id": 10}]
+        assert drain(loop, second) == [{"id": 10}]
+        assert drain(loop, other) == []
+
+    def test_full_buffer_drops_oldest_events(self, loop, settings):
+        settings.STREAM_BUFFER_SIZE = 2
+        hub = streams.CommentHub()
+        subscriber = hub.subscribe(1, loop)
+
+        hub.publish(1, [{"id": 1}, {"id": 2}, {"id": 3}])
+
+        assert drain(loop, subscriber) == [{"id": 2}, {"id": 3}]
+        assert subscriber.dropped == 1
+
+    def test_unsubscribe_stops_delivery(self, loop):
+        hub = streams.CommentHub()
+        subscriber = hub.subscribe(1, loop)
+
+        hub.unsubscribe(subscriber)
+        hub.publish(1, [{"id": 1}])
+
+        assert hub.subscriber_count == 0
+        assert drain(loop, subscriber) == []
+
+
+class TestCommentPublishing:
+    def test_new_comment_is_published_after_commit(
+        self, api_client, post_factory, loop, django_capture_on_commit_callbacks,
+    ):
+        post = post_factory()
+        subscriber = streams.hub.subscribe(post.pk, loop)
+        try:
+            with django_capture_on_commit_callbacks(execute=True):
+                response = api_client.post(
+                    reverse("post-comment-create", kwargs={"post_pk": post.pk}),
+                    {"content": "Live comment"},
+                )
+            events = drain(loop, subscriber)
+        finally:
+            streams.hub.unsubscribe(subscriber)
+
+        assert [event["id"] for event in events] == [response.data["id"]]
+        assert events[0]["content"] == "Live comment"
+
+    def test_bulk_comments_are_published(
+        self, authenticated_client, post_factory, loop, django_capture_on_commit_callbacks,
+    ):
+        post = post_factory()
+        subscriber = streams.hub.subscribe(post.pk, loop)
+        try:
+            with django_capture_on_commit_callbacks(execute=True):
+                authenticated_client.post(
+                    reverse("post-comment-bulk-create", kwargs={"post_pk": post.pk}),
+                    [{"content": "First one"}, {"content": "Second one"}],
+                    format="json",
+                )
+            events = drain(loop, subscriber)
+        finally:
+            streams.hub.unsubscribe(subscriber)
+
+        assert [event["content"] for event in events] == ["First one", "Second one"]
+
+
+class TestCommentStreamEndpoint:
+    def test_unknown_post_returns_404(self):
+        url = reverse("post-comment-stream", kwargs={"post_pk": 999_999})
+
+        response = async_to_sync(AsyncClient().get)(url)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_only_get_is_allowed(self, post_factory):
+        post = post_factory()
+        url = reverse("post-comment-stream", kwargs={"post_pk": post.pk})
+
+        response = async_to_sync(AsyncClient().post)(url)
+
+        assert response.status_code == status.HTTP_405_METHOD_NOT_ALLOWED
+
+    def test_streams_published_comments(self, post_factory):
+        post = post_factory()
+        url = reverse("post-comment-stream", kwargs={"post_pk": post.pk})
+
+        async def read_stream() -> list[str]:
+            response = await AsyncClient().get(url)
+            assert response["Content-Type"] == "text/event-stream"
+            content = aiter(response.streaming_content)
+            chunks = [await anext(content)]
+            streams.hub.publish(post.pk, [{"id": 7, "content": "Hello"}])
+            chunks.append(await anext(content))
+            await content.aclose()
+            return [chunk.decode() for chunk in chunks]
+
+        chunks = async_to_sync(read_stream)()
+
+        assert chunks[0].startswith("retry: ")
+        assert chunks[1] == (
+            'id: 7\nevent: comment\ndata: {"id": 7, "content": "Hello"}\n\n'
+        )
+        assert streams.hub.subscriber_count == 0
+
+    def test_replays_comments_after_last_event_id(self, post_factory):
+        post = post_factory()
+        seen = Comment.objects.create(post=post, content="Already seen")
+        missed = Comment.objects.create(post=post, content="Missed while away")
+        url = reverse("post-comment-stream", kwargs={"post_pk": post.pk})
+
+        async def read_stream() -> str:
+            headers = {"Last-Event-ID": str(seen.pk)}
+            response = await AsyncClient().get(url, headers=headers)
+            content = aiter(response.streaming_content)
+            await anext(content)
+            replayed = await anext(content)
+            await content.aclose()
+            return replayed.decode()
+
+        replayed = async_to_sync(read_stream)()
+
+        assert replayed.startswith(f"id: {missed.pk}\n")
+        assert "Missed while away" in replayed
+
+    def test_unread_stream_holds_no_subscriber(self, post_factory):
+        post = post_factory()
+        url = reverse("post-comment-stream", kwargs={"post_pk": post.pk})
+
+        response = async_to_sync(AsyncClient().get)(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert streams.hub.subscriber_count == 0
+
+    def test_cancelled_setup_releases_subscriber(self, post_factory, monkeypatch):
+        post = post_factory()
+        url = reverse("post-comment-stream", kwargs={"post_pk": post.pk})
+
+        async def cancelled(*_args):
+            raise asyncio.CancelledError
+
+        monkeypatch.setattr(streams, "missed_events", cancelled)
+
+        async def read_stream() -> int:
+            headers = {"Last-Event-ID": "1"}
+            response = await AsyncClient().get(url, headers=headers)
+            content = aiter(response.streaming_content)
+            await anext(content)
+            subscribed = streams.hub.subscriber_count
+            with pytest.raises(asyncio.CancelledError):
+                await anext(content)
+            return subscribed
+
+        assert async_to_sync(read_stream)() == 1
+        assert streams.hub.subscriber_count == 0
+
+    def test_rejects_streams_over_the_limit(self, post_factory, settings):
+        settings.STREAM_MAX_SUBSCRIBERS = 0
+        post = post_factory()
+        url = reverse("post-comment-stream", kwargs={"post_pk": post.pk})
+
+        response = async_to_sync(AsyncClient().get)(url)
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPostgresStreamBackend:
+    def test_large_comments_are_notified_by_id(self, post_factory, loop, settings):
+        post = post_factory()
+        comment = Comment.objects.create(post=post, content="word " * 2000)
+        listener = psycopg2.connect(**connection.get_connection_params())
+        listener.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        subscriber = streams.hub.subscribe(post.pk, loop)
+        try:
+            with listener.cursor() as cursor:
+                cursor.execute(f"LISTEN {settings.STREAM_CHANNEL}")
+            backend = streams.PostgresStreamBackend()
+            backend.publish(post.pk, streams.comment_events([comment]))
+
+            select.select([listener], [], [], 5)
+            listener.poll()
+            payload = listener.notifies.pop(0).payload
+            backend.dispatch(payload)
+            events = drain(loop, subscriber)
+        finally:
+            streams.hub.unsubscribe(subscriber)
+            listener.close()
+
+        assert json.loads(payload) == {"post": post.pk, "ids": [comment.pk]}
+        assert [event["id"] for event in events] == [comment.pk]
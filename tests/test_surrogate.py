@@ -0,0 +1,95 @@
+import pytest
+
+from django.urls import reverse
+
+from api.surrogate import LocalPurgeBackend
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def local_purge_backend(settings):
+    settings.CACHE_PURGE_BACKEND = "api.surrogate.LocalPurgeBackend"
+    LocalPurgeBackend.reset()
+
+
+class TestSurrogateHeaders:
+    def test_anonymous_detail_is_public_and_tagged(self, api_client, post_factory, settings):
+        post = post_factory()
+
+        response = api_client.get(reverse("post-detail", kwargs={"pk": post.pk}))
+
+        assert response["Cache-Control"] == f"public, max-age={settings.PROXY_CACHE_MAX_AGE}"
+        assert response["Surrogate-Key"] == f"author-{post.author_id} post-{post.pk}"
+        assert "Authorization" in response["Vary"]
+
+    def test_cached_detail_keeps_its_tags(self, api_client, post_factory):
+        post = post_factory()
+        url = reverse("post-detail", kwargs={"pk": post.pk})
+        first = api_client.get(url)
+
+        second = api_client.get(url)
+
+        assert second["Surrogate-Key"] == first["Surrogate-Key"]
+
+    def test_list_is_tagged_with_scope_and_posts(self, api_client, multiple_posts):
+        response = api_client.get(reverse("post-list"))
+
+        keys = response["Surrogate-Key"].split()
+        assert "posts" in keys
+        assert f"post-{multiple_posts[0].pk}" in keys
+        assert f"author-{multiple_posts[0].author_id}" in keys
+
+    def test_authenticated_response_is_private(self, authenticated_author_client, post_factory):
+        client, author = authenticated_author_client
+        post = post_factory(author=author)
+
+        response = client.get(reverse("post-detail", kwargs={"pk": post.pk}))
+
+        assert "private" in response["Cache-Control"]
+        assert "Surrogate-Key" not in response
+
+    def test_missing_post_is_not_public(self, api_client):
+        response = api_client.get(reverse("post-detail", kwargs={"pk": 999_999}))
+
+        assert "private" in response["Cache-Control"]
+
+
+class TestPurge:
+    def test_post_update_purges_post_and_lists(
+        self, post_factory, django_capture_on_commit_callbacks,
+    ):
+        post = post_factory()
+        LocalPurgeBackend.reset()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            post.title = "Renamed"
+            post.save()
+
+        assert set(LocalPurgeBackend.purged) == {f"post-{post.pk}", "posts"}
+
+    def test_comment_purges_only_its_post(
+        self, authenticated_client, post_factory, django_capture_on_commit_callbacks,
+    ):
+        post = post_factory()
+        LocalPurgeBackend.reset()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            authenticated_client.post(
+                reverse("post-comment-bulk-create", kwargs={"post_pk": post.pk}),
+                [{"content": "First!"}, {"content": "Second!"}],
+                format="json",
+            )
+
+        assert set(LocalPurgeBackend.purged) == {f"post-{post.pk}"}
+
+    def test_author_update_purges_author(
+        self, author_factory, django_capture_on_commit_callbacks,
+    ):
+        author = author_factory()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            author.name = "Renamed"
+            author.save()
+
+        assert LocalPurgeBackend.purged == [f"author-{author.pk}"]
@@ -0,0 +1,135 @@
+import pytest
+
+from django.urls import reverse
+from rest_framework import status
+
+from blog import PostStatus
+from blog.models import Post, Tag
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture()
+def tagged_posts(author_factory, post_factory):
+    author = author_factory()
+    both = post_factory(author=author, title="Both")
+    python = post_factory(author=author, title="Python only")
+    django = post_factory(author=author, title="Django only")
+    both.tags.set(Tag.objects.bulk_create([
+        Tag(name="Python", slug="python"),
+        Tag(name="Django", slug="django"),
+    ]))
+    python.tags.add(Tag.objects.get(slug="python"))
+    django.tags.add(Tag.objects.get(slug="django"))
+    return {"both": both, "python": python, "django": django}
+
+
+def tag_counts() -> dict[str, int]:
+    return dict(Tag.objects.values_list("slug", "post_count"))
+
+
+class TestTagCounts:
+    def test_counts_follow_tag_changes(self, tagged_posts):
+        assert tag_counts() == {"python": 2, "django": 2}
+
+        tagged_posts["both"].tags.remove(Tag.objects.get(slug="django"))
+        tagged_posts["python"].tags.clear()
+
+        assert tag_counts() == {"python": 1, "django": 1}
+
+    def test_reverse_clear_resets_count(self, tagged_posts):
+        Tag.objects.get(slug="python").posts.clear()
+
+        assert tag_counts() == {"python": 0, "django": 2}
+
+    def test_counts_exclude_unpublished_posts(self, tagged_posts):
+        post = Post.objects.get(pk=tagged_posts["both"].pk)
+        post.status = PostStatus.DRAFT
+        post.save()
+        assert tag_counts() == {"python": 1, "django": 1}
+
+        post.status = PostStatus.PUBLISHED
+        post.save()
+        assert tag_counts() == {"python": 2, "django": 2}
+
+    def test_delete_decrements_counts(self, tagged_posts):
+        Post.objects.get(pk=tagged_posts["both"].pk).delete()
+
+        assert tag_counts() == {"python": 1, "django": 1}
+
+    def test_reverse_add_counts_visible_posts(self, author_factory, post_factory):
+        author = author_factory()
+        tag = Tag.objects.create(name="News", slug="news")
+        published = post_factory(author=author, title="Published")
+        draft = post_factory(author=author, title="Draft", status=PostStatus.DRAFT)
+
+        tag.posts.add(published, draft)
+
+        assert tag_counts() == {"news": 1}
+
+
+class TestTagFilter:
+    def test_any_matches_posts_with_either_tag(self, api_client, tagged_posts):
+        response = api_client.get(reverse("post-list"), {"tags": "python,django"})
+
+        assert sorted(post["title"] for post in response.data) == [
+            "Both", "Django only", "Python only",
+        ]
+
+    def test_all_matches_posts_with_every_tag(self, api_client, tagged_posts):
+        response = api_client.get(
+            reverse("post-list"), {"tags": "python,django", "tags_match": "all"},
+        )
+
+        assert [post["title"] for post in response.data] == ["Both"]
+
+    def test_unknown_tag_under_all_matches_nothing(self, api_client, tagged_posts):
+        response = api_client.get(
+            reverse("post-list"), {"tags": "python,missing", "tags_match": "all"},
+        )
+
+        assert response.data == []
+
+    def test_too_many_tags_is_rejected(self, api_client, settings):
+        settings.TAGS_FILTER_MAX = 2
+
+        response = api_client.get(reverse("post-list"), {"tags": "a,b,c"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class TestTagEndpoints:
+    def test_tag_cloud_orders_by_count(self, api_client, tagged_posts):
+        tagged_posts["django"].tags.clear()
+
+        response = api_client.get(reverse("tag-cloud"))
+
+        assert response.data == [
+            {"name": "Python", "slug": "python", "count": 2},
+            {"name": "Django", "slug": "django", "count": 1},
+        ]
+
+    def test_create_post_with_tags(self, authenticated_author_client):
+        client, _ = authenticated_author_client
+
+        response = client.post(
+            reverse("post-list"),
+            {
+                "title": "Tagged",
+                "content": "Content.",
+                "status": PostStatus.PUBLISHED,
+                "tags": ["Web Dev", "python", "web-dev"],
+            },
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert sorted(response.data["tags"]) == ["python", "web-dev"]
+        assert tag_counts() == {"python": 1, "web-dev": 1}
+
+    def test_detail_lists_tags(self, api_client, tagged_posts):
+        url = reverse("post-detail", kwargs={"pk": tagged_posts["both"].pk})
+
+        response = api_client.get(url)
+
+        assert sorted(response.data["tags"]) == ["django", "python"]
@@ -0,0 +1,158 @@
+import threading
+
+from io import StringIO
+
+import pytest
+
+from django.core.management import call_command
+
+from tasks import TaskStatus
+from tasks.models import QueuedTask
+from tasks.runner import TaskPool, metrics, pool, registry, task
+
+pytestmark = pytest.mark.django_db
+
+calls = []
+
+
+@task(name="tests.record")
+def record(value):
+    calls.append(value)
+
+
+@task(name="tests.record_once", dedupe=True)
+def record_once(value):
+    calls.append(value)
+
+
+@task(name="tests.explode", max_attempts=2)
+def explode():
+    raise RuntimeError("boom")
+
+
+@pytest.fixture(autouse=True)
+def reset_state():
+    calls.clear()
+    metrics.reset()
+    yield
+    pool.reset()
+
+
+class TestInProcessTasks:
+    def test_delay_runs_only_after_commit(self, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            record.delay(1)
+            assert calls == []
+
+        assert len(callbacks) == 1
+        assert calls == [1]
+
+    def test_direct_call_runs_synchronously(self):
+        record(2)
+
+        assert calls == [2]
+
+    def test_pool_runs_tasks_in_background_threads(self, settings):
+        settings.TASKS_ALWAYS_EAGER = False
+        done = threading.Event()
+        threads = []
+
+        @task(name="tests.thread_name")
+        def thread_name():
+            threads.append(threading.current_thread().name)
+            done.set()
+
+        pool.submit(thread_name, (), {})
+
+        assert done.wait(timeout=5)
+        assert threads[0].startswith("tasks")
+
+    def test_identical_queued_tasks_are_deduplicated(self, settings):
+        settings.TASKS_ALWAYS_EAGER = False
+        settings.TASKS_WORKERS = 1
+        release = threading.Event()
+
+        @task(name="tests.block")
+        def block():
+            release.wait(timeout=5)
+
+        local_pool = TaskPool()
+        local_pool.submit(block, (), {})
+        for _ in range(3):
+            local_pool.submit(record_once, ("same",), {})
+        release.set()
+        local_pool._executor.shutdown(wait=True)
+
+        assert calls == ["same"]
+        assert metrics.snapshot()["deduplicated"] == 2
+
+    def test_full_queue_runs_task_inline(self, settings):
+        settings.TASKS_ALWAYS_EAGER = False
+        settings.TASKS_QUEUE_SIZE = 1
+        release = threading.Event()
+
+        @task(name="tests.hold")
+        def hold():
+            release.wait(timeout=5)
+
+        local_pool = TaskPool()
+        local_pool.submit(hold, (), {})
+        local_pool.submit(record, ("inline",), {})
+
+        assert calls == ["inline"]
+        assert metrics.snapshot()["overflowed"] == 1
+        release.set()
+        local_pool._executor.shutdown(wait=True)
+
+
+class TestDurableTasks:
+    def test_delay_stores_task_in_queue(self, settings):
+        settings.TASKS_DURABLE = True
+
+        record.delay(3)
+
+        queued = QueuedTask.objects.get()
+        assert queued.name == "tests.record"
+        assert queued.arguments == {"args": [3], "kwargs": {}}
+        assert calls == []
+
+    def test_identical_pending_tasks_collapse(self, settings):
+        settings.TASKS_DURABLE = True
+
+        record_once.delay("x")
+        record_once.delay("x")
+        record_once.delay("y")
+
+        assert QueuedTask.objects.count() == 2
+
+    def test_run_tasks_executes_and_removes_tasks(self, settings):
+        settings.TASKS_DURABLE = True
+        record.delay(4)
+        record.delay(5)
+
+        call_command("run_tasks", "--once", stdout=StringIO())
+
+        assert sorted(calls) == [4, 5]
+        assert not QueuedTask.objects.exists()
+
+    def test_failing_task_is_retried_then_marked_failed(self, settings):
+        settings.TASKS_DURABLE = True
+        settings.TASKS_RETRY_DELAY = 0
+        explode.delay()
+
+        call_command("run_tasks", "--once", stdout=StringIO())
+
+        queued = QueuedTask.objects.get()
+        assert queued.status == TaskStatus.FAILED
+        assert queued.attempts == 2
+        assert metrics.snapshot()["retried"] == 1
+
+    def test_unknown_task_is_marked_failed(self):
+        QueuedTask.objects.create(name="tests.missing", dedupe_key="missing")
+
+        call_command("run_tasks", "--once", stdout=StringIO())
+
+        assert QueuedTask.objects.get().status == TaskStatus.FAILED
+
+    def test_tasks_are_registered_by_name(self):
+        assert registry["blog.tasks.record_comments"].name == "blog.tasks.record_comments"
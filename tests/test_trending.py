@@ -0,0 +1,77 @@
+from io import StringIO
+
+import pytest
+
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+from rest_framework import status
+
+from blog.models import Post
+
+pytestmark = pytest.mark.django_db
+
+
+class TestTrendingScore:
+    def test_new_post_starts_with_recency_boost(self, post_factory, settings):
+        post = post_factory()
+
+        assert post.trending_score == settings.TRENDING_NEW_POST_SCORE
+
+    def test_comment_increments_score_after_commit(
+        self, api_client, post_factory, settings, django_capture_on_commit_callbacks,
+    ):
+        post = post_factory()
+        url = reverse("post-comment-create", kwargs={"post_pk": post.pk})
+
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.post(url, {"content": "Hot take."}, format="json")
+        post.refresh_from_db()
+
+        assert post.trending_score == (
+            settings.TRENDING_NEW_POST_SCORE + settings.TRENDING_COMMENT_SCORE
+        )
+
+    def test_decay_command_scales_and_floors_scores(self, author_factory, post_factory):
+        author = author_factory()
+        hot = post_factory(author=author, title="Hot")
+        cold = post_factory(author=author, title="Cold")
+        Post.objects.filter(pk=hot.pk).update(trending_score=8)
+        Post.objects.filter(pk=cold.pk).update(trending_score=0.015)
+
+        call_command("decay_trending", "--factor", "0.5", stdout=StringIO())
+        hot.refresh_from_db()
+        cold.refresh_from_db()
+
+        assert hot.trending_score == 4
+        assert cold.trending_score == 0
+
+    def test_decay_command_rejects_zero_factor(self):
+        with pytest.raises(CommandError):
+            call_command("decay_trending", "--factor", "0", stdout=StringIO())
+
+
+class TestTrendingEndpoint:
+    def test_returns_active_posts_by_score(self, api_client, author_factory, post_factory):
+        author = author_factory()
+        low = post_factory(author=author, title="Low")
+        high = post_factory(author=author, title="High")
+        inactive = post_factory(author=author, title="Inactive", active=False)
+        Post.objects.filter(pk=low.pk).update(trending_score=2)
+        Post.objects.filter(pk=high.pk).update(trending_score=5)
+        Post.objects.filter(pk=inactive.pk).update(trending_score=10)
+
+        response = api_client.get(reverse("post-trending"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [post["title"] for post in response.data] == ["High", "Low"]
+
+    def test_limit_is_applied(self, api_client, multiple_posts):
+        response = api_client.get(reverse("post-trending"), {"limit": 1})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data) == 1
+
+    def test_invalid_limit_fails(self, api_client):
+        response = api_client.get(reverse("post-trending"), {"limit": "many"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,91 @@
+from unittest import mock
+
+import pytest
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from api import warmup
+from blog import viewcounts
+from blog.models import Post
+
+pytestmark = pytest.mark.django_db
+
+
+def stored_views(*posts: Post) -> list[int]:
+    rows = Post.objects.filter(pk__in=[post.pk for post in posts])
+    views = dict(rows.values_list("id", "views"))
+    return [views[post.pk] for post in posts]
+
+
+class TestViewCounter:
+    def test_flush_writes_all_deltas_in_one_query(self, author_factory, post_factory):
+        author = author_factory()
+        first = post_factory(author=author, title="First")
+        second = post_factory(author=author, title="Second")
+        for post in (first, first, first, second):
+            viewcounts.record_view(post.pk)
+
+        with CaptureQueriesContext(connection) as queries:
+            flushed = viewcounts.flush_views()
+
+        assert flushed == 2
+        assert len(queries) == 1
+        assert stored_views(first, second) == [3, 1]
+        assert viewcounts.counter.pending == {}
+
+    def test_flush_adds_to_stored_counts(self, post_factory):
+        post = post_factory()
+        Post.objects.filter(pk=post.pk).update(views=10)
+        viewcounts.record_view(post.pk)
+
+        viewcounts.flush_views()
+
+        assert stored_views(post) == [11]
+
+    def test_failed_flush_keeps_counts(self, post_factory):
+        post = post_factory()
+        viewcounts.record_view(post.pk)
+
+        with mock.patch.object(viewcounts, "add_views", side_effect=RuntimeError):
+            assert viewcounts.flush_views() == 0
+
+        assert viewcounts.counter.pending == {post.pk: 1}
+
+
+class TestPostViews:
+    def test_retrieve_counts_cache_hits_without_writing(self, api_client, post_factory):
+        post = post_factory()
+        url = reverse("post-detail", kwargs={"pk": post.pk})
+        api_client.get(url)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url)
+
+        assert response.status_code == 200
+        assert len(queries) == 0
+        assert viewcounts.counter.pending == {post.pk: 2}
+
+    def test_missing_post_is_not_counted(self, api_client):
+        api_client.get(reverse("post-detail", kwargs={"pk": 999_999}))
+
+        assert viewcounts.counter.pending == {}
+
+    def test_warmup_is_not_counted(self, post_factory):
+        post = post_factory()
+
+        warmup.fetch(reverse("post-detail", kwargs={"pk": post.pk}), "localhost")
+
+        assert viewcounts.counter.pending == {}
+
+    def test_list_sorts_by_views(self, api_client, author_factory, post_factory):
+        author = author_factory()
+        quiet = post_factory(author=author, title="Quiet")
+        popular = post_factory(author=author, title="Popular")
+        Post.objects.filter(pk=popular.pk).update(views=5)
+
+        response = api_client.get(reverse("post-list"), {"ordering": "-views"})
+
+        assert [post["id"] for post in response.data] == [popular.pk, quiet.pk]
+        assert response.data[0]["views"] == 5